@@ -48,8 +48,15 @@ specifies whether or not chunks are aligned on 2-byte boundaries.  The
 default is 1, i.e. aligned.
 """
 
+import mmap
+import queue
+import struct
+import threading
 import warnings
 
+DEFAULT_READ_AHEAD = 4 * 1024 ** 2
+DEFAULT_QUEUE_DEPTH = 8
+
 
 class Chunk:
     def __init__(self, file, align=True, bigendian=True, inclheader=False):
@@ -62,7 +69,7 @@ class Chunk:
         else:
             strflag = "<"
         self.file = file
-        self.chunkname = file.read(4)
+        self.chunkname = bytes(file.read(4))
         if len(self.chunkname) < 4:
             raise EOFError
         try:
@@ -169,3 +176,171 @@ class Chunk:
             dummy = self.read(n)
             if not dummy:
                 raise EOFError
+
+
+class BufferFile:
+    """A read-only file-like object over a buffer.
+
+    read() returns memoryview slices of the buffer instead of copies, so
+    the chunks read from it share the buffer's memory.
+    """
+
+    def __init__(self, buffer):
+        self.closed = False
+        self.view = memoryview(buffer)
+        self.pos = 0
+
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        end = len(self.view)
+        if size >= 0:
+            end = min(end, self.pos + size)
+        data = self.view[self.pos : end]
+        self.pos = max(self.pos, end)
+        return data
+
+    def seek(self, pos, whence=0):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if whence == 1:
+            pos = pos + self.pos
+        elif whence == 2:
+            pos = pos + len(self.view)
+        if pos < 0:
+            raise OSError("negative seek position")
+        self.pos = pos
+        return self.pos
+
+    def tell(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        return self.pos
+
+    def close(self):
+        self.closed = True
+        try:
+            self.view.release()
+        except BufferError:
+            pass  # Arrays made from the chunks still use the buffer.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class MappedFile(BufferFile):
+    """A memory mapped file, see BufferFile."""
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        super().__init__(self.mmap)
+
+    def close(self):
+        super().close()
+        try:
+            self.mmap.close()
+        except BufferError:
+            # The mapping is unmapped once the last view of it is freed.
+            pass
+
+
+class ChunkReader:
+    """Read whole root chunks ahead of their use on a thread.
+
+    The thread reads the file in blocks of read_ahead bytes, and puts each
+    complete chunk, header and padding included, on a queue holding at most
+    queue_depth chunks.  Iterating over the reader gives the chunks in file
+    order, each one ready to be read with Chunk(BufferFile(chunk)).  Any
+    bytes left over that are too few to be a chunk come last.
+    """
+
+    def __init__(
+        self,
+        file,
+        read_ahead=DEFAULT_READ_AHEAD,
+        queue_depth=DEFAULT_QUEUE_DEPTH,
+        align=True,
+    ):
+        self.file = file
+        self.read_ahead = max(read_ahead, 8)
+        self.align = align
+        self.queue = queue.Queue(maxsize=max(queue_depth, 1))
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.produce, daemon=True)
+        self.thread.start()
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce(self):
+        try:
+            self.read_chunks()
+        except Exception as err:
+            self.put(err)
+        else:
+            self.put(None)
+
+    def read_chunks(self):
+        pending = bytearray()
+        start = 0
+        eof = False
+        while not self.stopped.is_set():
+            if len(pending) - start < 8 and not eof:
+                del pending[:start]
+                start = 0
+                data = self.file.read(self.read_ahead)
+                pending += data
+                eof = not data
+                continue
+            if len(pending) - start < 8:
+                if len(pending) > start:
+                    self.put(bytes(pending[start:]))
+                return
+
+            (size,) = struct.unpack_from(">L", pending, start + 4)
+            end = 8 + size + (size & 1 if self.align else 0)
+            if len(pending) - start >= end:
+                chunk = bytes(pending[start : start + end])
+                start += end
+            else:
+                # Read the rest of a big chunk straight into its own buffer.
+                chunk = pending[start:]
+                pending = bytearray()
+                start = 0
+                while len(chunk) < end and not self.stopped.is_set():
+                    data = self.file.read(min(end - len(chunk), self.read_ahead))
+                    if not data:
+                        eof = True
+                        break
+                    chunk += data
+            if not self.put(chunk):
+                return
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
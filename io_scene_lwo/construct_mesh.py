@@ -19,46 +19,80 @@
 import bpy
 import bmesh
 import mathutils
-from .gen_material import lwo2cycles, get_existing
+import numpy as np
+from .gen_material import (
+    lwo2cycles,
+    get_existing,
+    get_shared,
+    share_material,
+    shared_materials,
+)
+
+# A face attribute holding the surface indexes of a streamed mesh.
+SURF_ATTRIBUTE = "lwo_surf"
+
+
+def point_to_loops(data, vmap, out):
+    """Copy a point map's values onto every loop using those points."""
+    indices = data.pols.indices
+    size = max(
+        len(data.pnts),
+        vmap.pnt_ids.max(initial=-1) + 1,
+        indices.max(initial=-1) + 1,
+    )
+    lookup = np.full(size, -1, dtype=np.int64)
+    lookup[vmap.pnt_ids] = np.arange(len(vmap))
+    rows = lookup[indices]
+    mapped = rows >= 0
+    out[mapped] = vmap.values[rows[mapped]]
+
+
+def corner_to_loops(data, vmad, out):
+    """Copy a polygon map's values onto the matching loops.
+
+    A point used twice by a polygon only gets the value on its first loop.
+    """
+    loops = data.pols.find_corners(vmad.pol_ids, vmad.pnt_ids)
+    found = loops >= 0
+    out[loops[found]] = vmad.values[found]
 
 
 def create_mappack(data, map_name, map_type):
-    """Match the map data to faces."""
-    pack = {}
-
-    def color_pointmap(map):
-        for fi in range(len(data.pols)):
-            if fi not in pack:
-                pack[fi] = []
-            for pnt in data.pols[fi]:
-                if pnt in map:
-                    pack[fi].append(map[pnt])
-                else:
-                    pack[fi].append((1.0, 1.0, 1.0))
-
-    def color_facemap(map):
-        for fi in range(len(data.pols)):
-            if fi not in pack:
-                pack[fi] = []
-                for p in data.pols[fi]:
-                    pack[fi].append((1.0, 1.0, 1.0))
-            if fi in map:
-                for po in range(len(data.pols[fi])):
-                    if data.pols[fi][po] in map[fi]:
-                        pack[fi].insert(po, map[fi][data.pols[fi][po]])
-                        del pack[fi][po + 1]
+    """Match the map data to the mesh loops, one row per loop."""
+    pack = np.ones((len(data.pols.indices), 4), dtype=np.float32)
 
     if map_type == "COLOR":
         # Look at the first map, is it a point or face map
         if "PointMap" in data.colmaps[map_name]:
-            color_pointmap(data.colmaps[map_name]["PointMap"])
+            point_to_loops(data, data.colmaps[map_name]["PointMap"], pack[:, :3])
 
         if "FaceMap" in data.colmaps[map_name]:
-            color_facemap(data.colmaps[map_name]["FaceMap"])
+            corner_to_loops(data, data.colmaps[map_name]["FaceMap"], pack[:, :3])
 
     return pack
 
 
+def mesh_from_arrays(me, pnts, pols):
+    """Fill an empty mesh from the point array and CSR polygons.
+
+    This is what from_pydata does, without going through python lists.
+    """
+    me.vertices.add(len(pnts))
+    me.vertices.foreach_set("co", pnts.ravel())
+    if len(pols) == 0:
+        return
+
+    me.loops.add(len(pols.indices))
+    me.polygons.add(len(pols))
+    me.loops.foreach_set("vertex_index", pols.indices)
+    me.polygons.foreach_set("loop_start", pols.offsets[:-1])
+    if not bpy.types.MeshPolygon.bl_rna.properties["loop_total"].is_readonly:
+        me.polygons.foreach_set("loop_total", pols.counts)
+    if hasattr(me, "shade_flat"):
+        me.shade_flat()
+    me.update(calc_edges=True)
+
+
 def build_armature(layer_data, bones):
     """Build an armature from the skelegon data in the mesh."""
     print("Building Armature")
@@ -99,227 +133,320 @@ def build_armature(layer_data, bones):
 def build_materials(lwo, ch):
     print(f"Adding {len(lwo.surfs)} Materials")
 
+    # Equal surfaces, from this file or others, share one material.
+    shared = shared_materials() if ch.share_materials else None
     # renderer = bpy.context.scene.render.engine
     for key, surf in lwo.surfs.items():
         m = get_existing(surf, ch.use_existing_materials)
-        if m is None:
-            m = lwo2cycles(surf)
+        if m is None and shared is not None:
+            surf_hash = surf.content_hash()
+            m = get_shared(surf, surf_hash, shared)
+            if m is None:
+                m = lwo2cycles(surf, ch.loaded_images)
+                share_material(m, surf_hash, shared)
+        elif m is None:
+            m = lwo2cycles(surf, ch.loaded_images)
         lwo.materials[key] = m
 
 
+def assign_materials(lwo, me, surf_ids, surf_keys):
+    """Add the surfaces' materials to the mesh, and give each face its own."""
+    npols = len(me.polygons)
+    material_index = np.zeros(npols, dtype=np.int32)
+    use_smooth = np.zeros(npols, dtype=bool)
+    me.polygons.foreach_get("material_index", material_index)
+    me.polygons.foreach_get("use_smooth", use_smooth)
+
+    # Sort the faces by surface, so each surface's faces are one slice.
+    order = np.argsort(surf_ids, kind="stable")
+    sorted_ids = surf_ids[order]
+
+    mat_slot = 0
+    for surf_key in surf_keys:
+        if lwo.tags[surf_key] in lwo.materials:
+            material = lwo.materials[lwo.tags[surf_key]]
+            me.materials.append(material.mat)
+
+            start, end = np.searchsorted(sorted_ids, [surf_key, surf_key + 1])
+            material_index[order[start:end]] = mat_slot
+            use_smooth[order[start:end]] = material.smooth
+
+            mat_slot += 1
+
+    me.polygons.foreach_set("material_index", material_index)
+    me.polygons.foreach_set("use_smooth", use_smooth)
+
+
+def assign_streamed_materials(lwo):
+    """Give the streamed meshes their materials, now the surfaces are read."""
+    for me, surf_keys in lwo.unassigned:
+        attr = me.attributes[SURF_ATTRIBUTE]
+        surf_ids = np.empty(len(me.polygons), dtype=np.int32)
+        attr.data.foreach_get("value", surf_ids)
+        me.attributes.remove(attr)
+        assign_materials(lwo, me, surf_ids, surf_keys)
+    lwo.unassigned = []
+
+
+def finish_streamed(lwo):
+    """Tidy up the objects of an import that stopped before build_objects()
+    was done, so no mesh keeps its surface attribute and each one is
+    parented.  The materials that weren't made stay off."""
+    for me, _ in lwo.unassigned:
+        attr = me.attributes.get(SURF_ATTRIBUTE)
+        if attr is not None:
+            me.attributes.remove(attr)
+    lwo.unassigned = []
+    parent_objects(lwo)
+
+
+def object_mode():
+    """Before adding any meshes or armatures go into Object mode."""
+    if bpy.ops.object.mode_set.poll():
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+
 def build_objects(lwo, ch):
     """Using the gathered data, create the objects."""
-    ob_dict = {}  # Used for the parenting setup.
-
     build_materials(lwo, ch)
 
     # Single layer objects use the object file's name instead.
     if len(lwo.layers) and lwo.layers[-1].name == "Layer 1":
         lwo.layers[-1].name = lwo.name
         print(f"Building '{lwo.name}' Object")
-    else:
+    elif lwo.layers:
         print(f"Building {len(lwo.layers)} Objects")
 
-    # Before adding any meshes or armatures go into Object mode.
-    if bpy.ops.object.mode_set.poll():
+    object_mode()
+    for layer_data in lwo.layers:
+        build_layer(lwo, layer_data, ch)
+    # Let go of the layers, the objects hold everything now.
+    lwo.layers = []
+
+    assign_streamed_materials(lwo)
+    parent_objects(lwo)
+
+
+def stream_objects(lwo, ch):
+    """Read the file and build each layer as soon as it has been read.
+
+    The materials can't be made until the surfaces have been read, at the
+    end of the file, so build_objects() assigns them afterwards.
+    """
+    object_mode()
+    for layer_data in lwo.iter_layers(ch):
+        # Single layer objects use the object file's name instead.
+        if not lwo.layers and layer_data.name == "Layer 1":
+            layer_data.name = lwo.name
+        build_layer(lwo, layer_data, ch, stream=True)
+        # Don't hold on to the layer while the next one is read.
+        del layer_data
+
+
+def build_layer(lwo, layer_data, ch, stream=False):
+    """Build the object for one layer.
+
+    A streamed layer keeps its surface indexes in a face attribute until the
+    materials are made.
+    """
+    me = bpy.data.meshes.new(layer_data.name)
+    mesh_from_arrays(me, layer_data.pnts, layer_data.pols)
+    # me.validate()
+
+    # https://developer.blender.org/T75884
+    check_ngons = True
+    #         for i, pol in enumerate(layer_data.pols):
+    #             if 1 == len(layer_data.pols[i]):
+    #                 raise Exception(i, layer_data.pols[i])
+    #                 check_ngons = False
+
+    ob = bpy.data.objects.new(layer_data.name, me)
+
+    scn = bpy.context.collection
+    scn.objects.link(ob)
+    bpy.context.view_layer.objects.active = ob
+    ob.select_set(state=True)
+
+    lwo.objects[layer_data.index] = [ob, layer_data.parent_index]
+
+    # Move the object so the pivot is in the right place.
+    ob.location = layer_data.pivot
+
+    # Create the Material Slots and assign the MatIndex to the correct faces.
+    if stream:
+        # The triangulation below carries the attribute on to the new faces.
+        attr = me.attributes.new(SURF_ATTRIBUTE, "INT", "FACE")
+        attr.data.foreach_set("value", layer_data.surf_ids)
+        lwo.unassigned.append((me, layer_data.surf_keys))
+    else:
+        assign_materials(lwo, me, layer_data.surf_ids, layer_data.surf_keys)
+
+    # Create the Vertex Normals.
+    if len(layer_data.vnorms) > 0:
+        print("Adding Vertex Normals")
+        normals = np.empty((len(me.vertices), 3), dtype=np.float32)
+        me.vertices.foreach_get("normal", normals.ravel())
+        normals[layer_data.vnorms.pnt_ids] = layer_data.vnorms.values
+        me.vertices.foreach_set("normal", normals.ravel())
+
+    #         # Create the Split Vertex Normals.
+    #         print(len(layer_data.lnorms))
+    #         print(len(layer_data.vnorms))
+    # "tests/lwo_nasa/src/Wide Field Infrared Survey Telescope (WFIRST)/WFirst-2015-composite.lwo"
+    if len(layer_data.lnorms) > 0 and len(layer_data.vnorms) > 0:
+        pass
+        # raise Exception
+
+    # Create the Vertex Groups (LW's Weight Maps).
+    if len(layer_data.wmaps) > 0:
+        print(f"Adding {len(layer_data.wmaps)} Vertex Groups")
+        for wmap_key, wmap in layer_data.wmaps.items():
+            vgroup = ob.vertex_groups.new()
+            vgroup.name = wmap_key
+            # Add all the points sharing a weight in one call.
+            weights = wmap.values[:, 0]
+            order = np.argsort(weights, kind="stable")
+            unique, starts = np.unique(weights[order], return_index=True)
+            groups = np.split(wmap.pnt_ids[order], starts[1:])
+            for weight, pnt_ids in zip(unique.tolist(), groups):
+                vgroup.add(pnt_ids.tolist(), weight, "REPLACE")
+
+    # Create the Shape Keys (LW's Endomorphs).
+    if len(layer_data.morphs) > 0:
+        print(f"Adding {len(layer_data.morphs)} Shapes Keys")
+        ob.shape_key_add(name="Basis")  # Got to have a Base Shape.
+        for morph_key, morph in layer_data.morphs.items():
+            skey = ob.shape_key_add(name=morph_key)
+            co = np.empty((len(skey.data), 3), dtype=np.float32)
+            skey.data.foreach_get("co", co.ravel())
+            co[morph.pnt_ids] = morph.positions(layer_data.pnts)
+            skey.data.foreach_set("co", co.ravel())
+
+    # Create the Vertex Color maps.
+    if len(layer_data.colmaps) > 0:
+        print(f"Adding {len(layer_data.colmaps)} Vertex Color Maps")
+        for cmap_key in layer_data.colmaps:
+            map_pack = create_mappack(layer_data, cmap_key, "COLOR")
+            vertexColorMap = me.vertex_colors.new(name=cmap_key)
+            vertexColorMap.data.foreach_set("color", map_pack.ravel())
+
+    # Create the UV Maps.
+    if len(layer_data.uvmaps_vmad) > 0 or len(layer_data.uvmaps_vmap) > 0:
+        allmaps = set(list(layer_data.uvmaps_vmad.keys()))
+        allmaps = sorted(allmaps.union(set(list(layer_data.uvmaps_vmap.keys()))))
+        print(f"Adding {len(allmaps)} UV Textures")
+        if len(allmaps) > 8:
+            print(f"This mesh contains more than 8 UVMaps: {len(allmaps)}")
+
+        for uvmap_key in allmaps:
+
+            uvm = me.uv_layers.new()
+
+            if uvm is None:
+                break
+            uvm.name = uvmap_key
+
+        for uvmap_key in layer_data.uvmaps_vmad.keys():
+            uvcoords = layer_data.uvmaps_vmad[uvmap_key]["FaceMap"]
+            uvm = me.uv_layers.get(uvmap_key)
+            if uvm is None:
+                continue
+            uvs = np.empty((len(me.loops), 2), dtype=np.float32)
+            uvm.data.foreach_get("uv", uvs.ravel())
+            corner_to_loops(layer_data, uvcoords, uvs)
+            uvm.data.foreach_set("uv", uvs.ravel())
+        for uvmap_key in layer_data.uvmaps_vmap.keys():
+            uvcoords = layer_data.uvmaps_vmap[uvmap_key]["PointMap"]
+            uvm = me.uv_layers.get(uvmap_key)
+            if uvm is None:
+                continue
+            # Keep the VMAD values on the loops the point map misses.
+            uvs = np.empty((len(me.loops), 2), dtype=np.float32)
+            uvm.data.foreach_get("uv", uvs.ravel())
+            point_to_loops(layer_data, uvcoords, uvs)
+            uvm.data.foreach_set("uv", uvs.ravel())
+
+    # Apply the Edge Weighting.
+    if len(layer_data.edge_weights) > 0:
+        edge_weights = layer_data.edge_weights
+        verts = np.empty((len(me.edges), 2), dtype=np.int32)
+        me.edges.foreach_get("vertices", verts.ravel())
+        verts = verts.astype(np.int64)
+        keys = (verts.min(axis=1) << 32) | verts.max(axis=1)
+        rows = np.searchsorted(edge_weights.edges, keys)
+        rows = np.minimum(rows, len(edge_weights) - 1)
+        found = edge_weights.edges[rows] == keys
+
+        crease = np.zeros(len(me.edges), dtype=np.float32)
+        crease[found] = edge_weights.values[rows[found]]
+        if "crease" in bpy.types.MeshEdge.bl_rna.properties:
+            me.edges.foreach_set("crease", crease)
+        else:
+            # Blender 4.0 moved the creases to a generic attribute.
+            attr = me.attributes.get("crease_edge")
+            if attr is None:
+                attr = me.attributes.new("crease_edge", "FLOAT", "EDGE")
+            attr.data.foreach_set("value", crease)
+
+    # Now triangulate the NGons.
+    # if not 0 == len(ngons):
+    # if True:
+    if check_ngons:
+        bm = bmesh.new()
+        bm.from_mesh(me)  # Causes crashed in star field
+        if hasattr(bm.faces, "ensure_lookup_table"):
+            bm.faces.ensure_lookup_table()
+
+        faces = []
+        for face in bm.faces:
+            if len(face.verts) > 4:  # review this number
+                faces.append(face)
+        print(f"{len(faces)} NGONs")
+        bmesh.ops.triangulate(bm, faces=faces)
+
+        # Finish up, write the bmesh back to the mesh
+        bm.to_mesh(me)
+        bm.free()
+
+    # We may have some invalid mesh data, See: [#27916]
+    # keep this last!
+    print(f"Validating mesh: {me.name}...")
+    me.validate()
+
+    # Unfortunately we can't exlude certain faces from the subdivision.
+    if layer_data.has_subds and ch.add_subd_mod:
+        ob.modifiers.new(name="Subsurf", type="SUBSURF")
+
+    ob.modifiers.new(name="Edge Split", type="EDGE_SPLIT")
+
+    # Should we build an armature from the embedded rig?
+    if len(layer_data.bones) > 0 and ch.skel_to_arm:
+        bpy.ops.object.armature_add()
+        arm_object = bpy.context.active_object
+        arm_object.name = "ARM_" + layer_data.name
+        arm_object.data.name = arm_object.name
+        arm_object.location = layer_data.pivot
+        bpy.ops.object.mode_set(mode="EDIT")
+        build_armature(layer_data, arm_object.data.edit_bones)
         bpy.ops.object.mode_set(mode="OBJECT")
 
-    for layer_data in lwo.layers:
-        face_edges = []
-        me = bpy.data.meshes.new(layer_data.name)
-        me.from_pydata(layer_data.pnts, face_edges, layer_data.pols)
-        # me.validate()
-
-        # https://developer.blender.org/T75884
-        check_ngons = True
-        #         for i, pol in enumerate(layer_data.pols):
-        #             if 1 == len(layer_data.pols[i]):
-        #                 raise Exception(i, layer_data.pols[i])
-        #                 check_ngons = False
-
-        ob = bpy.data.objects.new(layer_data.name, me)
-
-        scn = bpy.context.collection
-        scn.objects.link(ob)
-        bpy.context.view_layer.objects.active = ob
-        ob.select_set(state=True)
-
-        ob_dict[layer_data.index] = [ob, layer_data.parent_index]
-
-        # Move the object so the pivot is in the right place.
-        ob.location = layer_data.pivot
-
-        # Create the Material Slots and assign the MatIndex to the correct faces.
-        mat_slot = 0
-        for surf_key in layer_data.surf_tags:
-            if lwo.tags[surf_key] in lwo.materials:
-                me.materials.append(lwo.materials[lwo.tags[surf_key]].mat)
-
-                for fi in layer_data.surf_tags[surf_key]:
-                    me.polygons[fi].material_index = mat_slot
-                    me.polygons[fi].use_smooth = lwo.materials[
-                        lwo.tags[surf_key]
-                    ].smooth
-
-                mat_slot += 1
-
-        # Create the Vertex Normals.
-        if len(layer_data.vnorms) > 0:
-            print("Adding Vertex Normals")
-            for vi in layer_data.vnorms.keys():
-                me.vertices[vi].normal = layer_data.vnorms[vi]
-
-        #         # Create the Split Vertex Normals.
-        #         print(len(layer_data.lnorms))
-        #         print(len(layer_data.vnorms))
-        # "tests/lwo_nasa/src/Wide Field Infrared Survey Telescope (WFIRST)/WFirst-2015-composite.lwo"
-        if len(layer_data.lnorms) > 0 and len(layer_data.vnorms) > 0:
-            pass
-            # raise Exception
-
-        # Create the Vertex Groups (LW's Weight Maps).
-        if len(layer_data.wmaps) > 0:
-            print(f"Adding {len(layer_data.wmaps)} Vertex Groups")
-            for wmap_key in layer_data.wmaps:
-                vgroup = ob.vertex_groups.new()
-                vgroup.name = wmap_key
-                wlist = layer_data.wmaps[wmap_key]
-                for pvp in wlist:
-                    vgroup.add((pvp[0],), pvp[1], "REPLACE")
-
-        # Create the Shape Keys (LW's Endomorphs).
-        if len(layer_data.morphs) > 0:
-            print(f"Adding {len(layer_data.morphs)} Shapes Keys")
-            ob.shape_key_add(name="Basis")  # Got to have a Base Shape.
-            for morph_key in layer_data.morphs:
-                skey = ob.shape_key_add(name=morph_key)
-                dlist = layer_data.morphs[morph_key]
-                for pdp in dlist:
-                    me.shape_keys.key_blocks[skey.name].data[pdp[0]].co = [
-                        pdp[1],
-                        pdp[2],
-                        pdp[3],
-                    ]
-
-        # Create the Vertex Color maps.
-        if len(layer_data.colmaps) > 0:
-            print(f"Adding {len(layer_data.colmaps)} Vertex Color Maps")
-            for cmap_key in layer_data.colmaps:
-                map_pack = create_mappack(layer_data, cmap_key, "COLOR")
-                vertexColorMap = me.vertex_colors.new(name=cmap_key)
-
-                for poly in me.polygons:
-                    if poly.index in map_pack:
-                        colors = map_pack[poly.index]
-                        for i, loop_index in enumerate(poly.loop_indices):
-                            vertexColorMap.data[loop_index].color = colors[i] + (1.0,)
-
-        # Create the UV Maps.
-        if len(layer_data.uvmaps_vmad) > 0 or len(layer_data.uvmaps_vmap) > 0:
-            allmaps = set(list(layer_data.uvmaps_vmad.keys()))
-            allmaps = sorted(allmaps.union(set(list(layer_data.uvmaps_vmap.keys()))))
-            print(f"Adding {len(allmaps)} UV Textures")
-            if len(allmaps) > 8:
-                print(f"This mesh contains more than 8 UVMaps: {len(allmaps)}")
-
-            for uvmap_key in allmaps:
-
-                uvm = me.uv_layers.new()
-
-                if uvm is None:
-                    break
-                uvm.name = uvmap_key
-
-            vertloops = {}
-            for v in me.vertices:
-                vertloops[v.index] = []
-            for k in me.loops:
-                vertloops[k.vertex_index].append(k.index)
-            for uvmap_key in layer_data.uvmaps_vmad.keys():
-                uvcoords = layer_data.uvmaps_vmad[uvmap_key]["FaceMap"]
-                uvm = me.uv_layers.get(uvmap_key)
-                if uvm is None:
-                    continue
-                for pol_id in uvcoords.keys():
-                    for pnt_id, (u, v) in uvcoords[pol_id].items():
-                        for li in me.polygons[pol_id].loop_indices:
-                            if pnt_id == me.loops[li].vertex_index:
-                                uvm.data[li].uv = [u, v]
-                                break
-            for uvmap_key in layer_data.uvmaps_vmap.keys():
-                uvcoords = layer_data.uvmaps_vmap[uvmap_key]["PointMap"]
-                uvm = me.uv_layers.get(uvmap_key)
-                if uvm is None:
-                    continue
-                for pnt_id, (u, v) in uvcoords.items():
-                    for li in vertloops[pnt_id]:
-                        uvm.data[li].uv = [u, v]
-
-        # Apply the Edge Weighting.
-        if len(layer_data.edge_weights) > 0:
-            for edge in me.edges:
-                edge_sa = "{0} {1}".format(edge.vertices[0], edge.vertices[1])
-                edge_sb = "{0} {1}".format(edge.vertices[1], edge.vertices[0])
-                if edge_sa in layer_data.edge_weights:
-                    edge.crease = layer_data.edge_weights[edge_sa]
-                elif edge_sb in layer_data.edge_weights:
-                    edge.crease = layer_data.edge_weights[edge_sb]
-
-        # Now triangulate the NGons.
-        # if not 0 == len(ngons):
-        # if True:
-        if check_ngons:
-            bm = bmesh.new()
-            bm.from_mesh(me)  # Causes crashed in star field
-            if hasattr(bm.faces, "ensure_lookup_table"):
-                bm.faces.ensure_lookup_table()
-
-            faces = []
-            for face in bm.faces:
-                if len(face.verts) > 4:  # review this number
-                    faces.append(face)
-            print(f"{len(faces)} NGONs")
-            bmesh.ops.triangulate(bm, faces=faces)
-
-            # Finish up, write the bmesh back to the mesh
-            bm.to_mesh(me)
-            bm.free()
-
-        # We may have some invalid mesh data, See: [#27916]
-        # keep this last!
-        print(f"Validating mesh: {me.name}...")
-        me.validate()
-
-        # Unfortunately we can't exlude certain faces from the subdivision.
-        if layer_data.has_subds and ch.add_subd_mod:
-            ob.modifiers.new(name="Subsurf", type="SUBSURF")
-
-        ob.modifiers.new(name="Edge Split", type="EDGE_SPLIT")
-
-        # Should we build an armature from the embedded rig?
-        if len(layer_data.bones) > 0 and ch.skel_to_arm:
-            bpy.ops.object.armature_add()
-            arm_object = bpy.context.active_object
-            arm_object.name = "ARM_" + layer_data.name
-            arm_object.data.name = arm_object.name
-            arm_object.location = layer_data.pivot
-            bpy.ops.object.mode_set(mode="EDIT")
-            build_armature(layer_data, arm_object.data.edit_bones)
-            bpy.ops.object.mode_set(mode="OBJECT")
-
-        # Clear out the dictionaries for this layer.
-        layer_data.bone_names.clear()
-        layer_data.bone_rolls.clear()
-        layer_data.wmaps.clear()
-        layer_data.colmaps.clear()
-        layer_data.uvmaps_vmad.clear()
-        layer_data.uvmaps_vmap.clear()
-        layer_data.morphs.clear()
-        layer_data.surf_tags.clear()
-
-        print("done!")
-
-    # With the objects made, setup the parents and re-adjust the locations.
+    # Let go of the dictionaries for this layer, they may still be in
+    # the session cache so aren't cleared.
+    layer_data.bone_names = {}
+    layer_data.bone_rolls = {}
+    layer_data.wmaps = {}
+    layer_data.colmaps = {}
+    layer_data.uvmaps_vmad = {}
+    layer_data.uvmaps_vmap = {}
+    layer_data.morphs = {}
+    layer_data.surf_keys = []
+
+    print("done!")
+
+
+def parent_objects(lwo):
+    """With the objects made, setup the parents and re-adjust the locations."""
+    ob_dict = lwo.objects
     if len(ob_dict.keys()) > 1:
         empty = bpy.data.objects.new(name=lwo.name + "_empty", object_data=None)
 
@@ -332,6 +459,7 @@ def build_objects(lwo, ch):
             ob_dict[ob_key][0].location -= parent_ob[0].location
         elif len(ob_dict.keys()) > 1:
             ob_dict[ob_key][0].parent = empty
+    lwo.objects = {}
 
     bpy.context.view_layer.update()
 
@@ -21,6 +21,9 @@ import bpy
 
 # from .NodeArrange import nodemargin, ArrangeNodesOp, values
 
+# The custom property shared materials keep their surface's hash in.
+MATERIAL_HASH = "lwo_hash"
+
 
 class _material:
     __slots__ = (
@@ -47,7 +50,56 @@ def get_existing(surf, use_existing_materials):
     return m
 
 
-def lwo2cycles(surf_data):
+def shared_materials():
+    """The materials made for shared surfaces so far, by the surface hash."""
+    shared = {}
+    for mat in bpy.data.materials:
+        key = mat.get(MATERIAL_HASH)
+        if key is not None and not mat.library:
+            shared.setdefault(key, mat)
+    return shared
+
+
+def get_shared(surf, key, shared):
+    """The material made for an equal surface, in this or an earlier import."""
+    x = shared.get(key)
+    if x is None:
+        return None
+    m = _material(surf.name)
+    m.mat = x
+    m.smooth = surf.smooth
+    return m
+
+
+def share_material(m, key, shared):
+    """Mark a new material as made for surfaces with this hash."""
+    m.mat[MATERIAL_HASH] = key
+    shared[key] = m.mat
+
+
+def image_key(image_path):
+    """Images are told apart by their absolute path, two wood.png files from
+    different folders are different images."""
+    return os.path.normcase(os.path.abspath(image_path))
+
+
+def load_image(image_path, loaded):
+    """The image for a file, loaded at most once per import.
+
+    loaded holds the images of the import by image_key(), so it can be
+    shared by every material and file in a batch.  Images loaded before the
+    import are used again by load's check_existing.  Blender only reads the
+    pixels when the image is first shown or rendered.
+    """
+    key = image_key(image_path)
+    image = loaded.get(key)
+    if image is None:
+        image = bpy.data.images.load(image_path, check_existing=True)
+        loaded[key] = image
+    return image
+
+
+def lwo2cycles(surf_data, loaded=None):
     m = _material(surf_data.name)
     mat_name = surf_data.name
 
@@ -69,11 +121,7 @@ def lwo2cycles(surf_data):
             if image_path is None:
                 continue
 
-            basename = os.path.basename(image_path)
-            image = bpy.data.images.get(basename)
-            if image is None:
-                image = bpy.data.images.load(image_path)
             i = nodes.new("ShaderNodeTexImage")
-            i.image = image
+            i.image = load_image(image_path, {} if loaded is None else loaded)
 
     return m
@@ -0,0 +1,222 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Look at LWO files without Blender.
+
+    python -m io_scene_lwo.lwo inspect file.lwo   # chunks, layers and names
+    python -m io_scene_lwo.lwo stats file.lwo     # parse it, counts and times
+    python -m io_scene_lwo.lwo dump file.lwo      # every record, streamed
+
+The exit status is 1 if any file couldn't be read, so it can check files
+in CI or on render farm nodes.
+"""
+
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+from .lwoObject import (
+    lwoObject,
+    lwoUnsupportedFileException,
+    _choices,
+    DEFAULT_SPLIT_CHUNK_SIZE,
+)
+from .lwoIndex import lwoIndex
+from .lwoStream import (
+    iter_records,
+    lwoClip,
+    lwoLayer,
+    lwoPoints,
+    lwoPolygons,
+    lwoPTag,
+    lwoSurface,
+    lwoTags,
+    lwoVMad,
+    lwoVMap,
+)
+
+
+def _quiet(verbose):
+    """The parser prints as it goes, only show that when asked to."""
+    if verbose:
+        return contextlib.nullcontext()
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _options(args):
+    return _choices(
+        LOAD_HIDDEN=args.hidden,
+        USE_SESSION_CACHE=False,
+        LAYER_THREADS=args.layer_threads,
+        READ_AHEAD=args.read_ahead * 1024 ** 2,
+        SPLIT_CHUNK_SIZE=args.split_chunks * 1024 ** 2,
+    )
+
+
+def inspect(filename, args):
+    """Print the chunk table, read without decoding the geometry."""
+    index = lwoIndex(filename)
+    t = time.perf_counter()
+    with _quiet(args.verbose):
+        index.read()
+    elapsed = time.perf_counter() - t
+
+    print(f"{filename}: {index.format.decode()}, {len(index.chunks)} chunks")
+    print(f"  indexed in {elapsed * 1000:.1f} ms")
+    for n, layer in enumerate(index.layers):
+        hidden = " hidden" if layer.hidden else ""
+        print(f"  layer {n}: '{layer.name}' index {layer.index}{hidden}")
+        for entry in index.layer_chunks(n):
+            subtype = f" {entry.subtype.decode()}" if entry.subtype else ""
+            print(f"    {entry.name.decode()}{subtype} {entry.size} bytes")
+    print(f"  {len(index.tags)} tags")
+    print(f"  {len(index.surf_names)} surfaces: {', '.join(index.surf_names)}")
+    for c_id, path in index.clips.items():
+        print(f"  clip {c_id}: {path}")
+
+
+def stats(filename, args):
+    """Parse the file and print what is in each layer, and how long it took."""
+    times = []
+    for _ in range(args.repeat):
+        lwo = lwoObject(filename)
+        t = time.perf_counter()
+        with _quiet(args.verbose):
+            lwo.read(_options(args))
+        times.append(time.perf_counter() - t)
+
+    print(f"{filename}: {len(lwo.layers)} layers")
+    for n, layer in enumerate(lwo.layers):
+        print(f"  layer {n}: '{layer.name}' index {layer.index}")
+        print(f"    {len(layer.pnts)} points, {len(layer.pols)} polygons")
+        counts = (
+            ("uv maps", len(set(layer.uvmaps_vmap) | set(layer.uvmaps_vmad))),
+            ("weight maps", len(layer.wmaps)),
+            ("color maps", len(layer.colmaps)),
+            ("morphs", len(layer.morphs)),
+            ("bones", len(layer.bones)),
+            ("edge weights", len(layer.edge_weights)),
+        )
+        print("    " + ", ".join(f"{count} {name}" for name, count in counts))
+        if len(layer.vnorms) or len(layer.lnorms):
+            print(f"    {len(layer.vnorms)} + {len(layer.lnorms)} normals")
+    print(f"  {len(lwo.surfs)} surfaces, {len(lwo.clips)} clips")
+    times = np.array(times) * 1000
+    line = f"  parsed in {times.min():.1f} ms"
+    if len(times) > 1:
+        line += f" (best of {len(times)}, mean {times.mean():.1f} ms)"
+    print(line)
+
+
+def _describe(record):
+    """One line about a streamed record."""
+    if isinstance(record, lwoLayer):
+        return f"LAYR {record.layer}: '{record.name}' index {record.index}"
+    if isinstance(record, lwoPoints):
+        return f"PNTS {record.layer}: {len(record.pnts)} from {record.first}"
+    if isinstance(record, lwoPolygons):
+        count = len(record.offsets) - 1
+        kind = record.kind.decode()
+        return f"POLS {record.layer}: {count} {kind} from {record.first}"
+    if isinstance(record, (lwoVMap, lwoVMad)):
+        name = "VMAP" if isinstance(record, lwoVMap) else "VMAD"
+        kind = record.kind.decode()
+        return f"{name} {record.layer}: {kind} '{record.name}' {len(record.values)}"
+    if isinstance(record, lwoPTag):
+        return f"PTAG {record.layer}: {record.kind.decode()} {len(record.tags)}"
+    if isinstance(record, lwoTags):
+        return f"TAGS: {len(record.tags)}"
+    if isinstance(record, lwoSurface):
+        return f"SURF: '{record.surf.name}'"
+    if isinstance(record, lwoClip):
+        return f"CLIP {record.id}: {record.path}"
+    return repr(record)
+
+
+def dump(filename, args):
+    """Print the records of the file as they are streamed from it."""
+    print(f"{filename}:")
+    records = iter_records(filename, _options(args))
+    while True:
+        with _quiet(args.verbose):
+            record = next(records, None)
+        if record is None:
+            break
+        print(f"  {_describe(record)}")
+
+
+COMMANDS = {
+    "inspect": inspect,
+    "stats": stats,
+    "dump": dump,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m io_scene_lwo.lwo",
+        description="Read LightWave Object files without Blender.",
+    )
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("files", nargs="+")
+    parser.add_argument(
+        "--hidden", action="store_true", help="read the hidden layers too"
+    )
+    parser.add_argument(
+        "--layer-threads",
+        type=int,
+        default=0,
+        help="threads to read layers with, 0 for one per core",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=0,
+        metavar="MB",
+        help="read ahead on another thread in blocks this big",
+    )
+    parser.add_argument(
+        "--split-chunks",
+        type=int,
+        default=DEFAULT_SPLIT_CHUNK_SIZE // 1024 ** 2,
+        metavar="MB",
+        help="decode chunks bigger than this on several threads, 0 never does",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="parse this many times for stats"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="show the parser's output"
+    )
+    args = parser.parse_args(argv)
+    args.repeat = max(args.repeat, 1)
+
+    failed = 0
+    for filename in args.files:
+        try:
+            COMMANDS[args.command](filename, args)
+        except (OSError, lwoUnsupportedFileException) as err:
+            print(f"{filename}: {err}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
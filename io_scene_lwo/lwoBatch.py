@@ -0,0 +1,102 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import os
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from .lwoObject import lwoObject
+
+
+def parse_file(filename, ch):
+    """Parse one file, this runs in a worker process."""
+    return lwoObject(filename).parse(ch)
+
+
+def read_files(filenames, ch, max_workers=None):
+    """Read LWO files in worker processes.
+
+    Yields an lwoObject for each file, in the order given, as soon as it
+    has been parsed, so the objects can be built while the later files are
+    still being parsed.  Files already in the session cache aren't parsed
+    again, and a single file is parsed here rather than in a new process.
+    If the workers can't start, the files are parsed here instead.
+    """
+    lwos = [lwoObject(filename) for filename in filenames]
+    parsed = []
+    for lwo in lwos:
+        lwo.ch = ch
+        parsed.append(lwo.session_data(ch))
+
+    todo = [lwo for lwo, data in zip(lwos, parsed) if data is None]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(todo))
+    if max_workers <= 1:
+        for lwo in lwos:
+            lwo.read(ch)
+            yield lwo
+        return
+
+    # The workers have nothing to share a session cache with.
+    worker_ch = copy.copy(ch)
+    worker_ch.use_session_cache = False
+    # Blender isn't safe to fork, start the workers afresh.
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    futures = []
+    broken = False
+    try:
+        for lwo, data in zip(lwos, parsed):
+            future = None
+            if data is None and not broken:
+                try:
+                    future = pool.submit(parse_file, lwo.filename, worker_ch)
+                except BrokenProcessPool as err:
+                    broken = _workers_failed(err)
+            futures.append(future)
+        for lwo, data, future in zip(lwos, parsed, futures):
+            if future is not None and not broken:
+                try:
+                    data = future.result()
+                except (BrokenProcessPool, ImportError) as err:
+                    broken = _workers_failed(err)
+                else:
+                    if data is not None:
+                        lwo.keep_session_data(ch, data)
+            if data is not None:
+                lwo.set_parsed(data)
+            elif broken:
+                lwo.read(ch)
+            yield lwo
+    finally:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        pool.shutdown()
+
+
+def _workers_failed(err):
+    """Spawned workers run the __main__ script again, and import the add-on
+    by its module name.  Under blender -b --python job.py the script imports
+    bpy, and an extension's bl_ext module name only exists in Blender, so
+    either can stop the workers.  The rest is parsed in this process."""
+    print(f"Parsing in this process, the worker processes failed: {err!r}")
+    return True
@@ -0,0 +1,272 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import os
+import sys
+import pickle
+import shutil
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+# Change this when the parsed data changes shape, so old entries are missed.
+CACHE_VERSION = 1
+DEFAULT_CACHE_SIZE = 2 * 1024 ** 3
+# Smaller arrays are kept in the metadata record instead of their own file.
+MIN_MAPPED_BYTES = 64 * 1024
+# Files bigger than this are hashed from samples of their content.
+HASH_SAMPLE_BYTES = 64 * 1024
+HASH_SAMPLES = 16
+METADATA = "lwo.pickle"
+# Off until a size is set in the add-on preferences, so an import doesn't
+# keep its arrays for the rest of the session unless asked to.
+DEFAULT_SESSION_SIZE = 0
+
+
+def default_cache_dir():
+    """The add-on's folder in Blender's user cache directory."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        base = os.path.join(base, "Blender Foundation", "Blender", "Cache")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches/Blender")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+        base = os.path.join(base, "blender")
+    return os.path.join(base, "io_scene_lwo")
+
+
+def content_hash(filename):
+    """Hash the file, or evenly spaced samples of it when it is big."""
+    h = hashlib.blake2b(digest_size=16)
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as f:
+        if size <= HASH_SAMPLES * HASH_SAMPLE_BYTES:
+            h.update(f.read())
+        else:
+            step = (size - HASH_SAMPLE_BYTES) // (HASH_SAMPLES - 1)
+            for i in range(HASH_SAMPLES):
+                f.seek(i * step)
+                h.update(f.read(HASH_SAMPLE_BYTES))
+    return h.hexdigest()
+
+
+def data_size(obj):
+    """Roughly how many bytes the arrays in some parsed data take up."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(data_size(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(data_size(v) for v in obj)
+    size = 0
+    for k in getattr(type(obj), "__slots__", ()):
+        size += data_size(getattr(obj, k, None))
+    return size
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Saves the bigger numpy arrays as .npy files next to the pickle."""
+
+    def __init__(self, file, dirpath):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.dirpath = dirpath
+        self.count = 0
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, np.ndarray) or obj.dtype.hasobject:
+            return None
+        if obj.nbytes < MIN_MAPPED_BYTES:
+            return None
+        name = f"{self.count}.npy"
+        self.count += 1
+        np.save(os.path.join(self.dirpath, name), obj, allow_pickle=False)
+        return name
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """Memory maps the .npy files back in, read-only."""
+
+    def __init__(self, file, dirpath):
+        super().__init__(file)
+        self.dirpath = dirpath
+
+    def persistent_load(self, pid):
+        path = os.path.join(self.dirpath, pid)
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+
+
+class lwoCache:
+    """A size-bounded disk cache of parsed LWO data.
+
+    Each entry is a directory named by its key, holding the pickled data
+    and its arrays.  The least recently used entries are removed once the
+    cache is bigger than max_size bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_CACHE_SIZE):
+        self.cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+        self.max_size = max_size
+
+    def key(self, filename, options=()):
+        """Key a file by its path, size, mtime and content, and the options
+        it is parsed with."""
+        filename = os.path.abspath(filename)
+        st = os.stat(filename)
+        h = hashlib.blake2b(digest_size=20)
+        for part in (
+            CACHE_VERSION,
+            filename,
+            st.st_size,
+            st.st_mtime_ns,
+            content_hash(filename),
+            options,
+        ):
+            h.update(repr(part).encode("utf-8"))
+        return h.hexdigest()
+
+    def load(self, key):
+        """Return the cached data, or None if it isn't there."""
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry, METADATA), "rb") as f:
+                data = _ArrayUnpickler(f, entry).load()
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            print(f"Dropping unreadable cache entry {entry}: {err}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        os.utime(entry)  # Mark it as recently used.
+        return data
+
+    def store(self, key, data):
+        entry = os.path.join(self.cache_dir, key)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(tmp, exist_ok=True)
+            with open(os.path.join(tmp, METADATA), "wb") as f:
+                _ArrayPickler(f, tmp).dump(data)
+            os.replace(tmp, entry)
+        except OSError as err:
+            # Another import may have stored it first, or the disk is full.
+            print(f"Could not write cache entry {entry}: {err}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def entries(self):
+        """The entries with their size and last use, oldest first."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        with os.scandir(self.cache_dir) as it:
+            for d in it:
+                if not d.is_dir() or d.name.endswith(".tmp"):
+                    continue
+                size = 0
+                with os.scandir(d.path) as files:
+                    for f in files:
+                        size += f.stat().st_size
+                entries.append((d.stat().st_mtime, size, d.path))
+        return sorted(entries)
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class lwoSessionCache:
+    """Parsed LWO data kept in memory for the rest of the Blender session.
+
+    Entries are keyed by path, size and mtime, so an edited file is read
+    again.  The least recently used entries are dropped once the arrays in
+    the cache take up more than max_size bytes, a max_size of 0 turns the
+    cache off.
+    """
+
+    def __init__(self, max_size=DEFAULT_SESSION_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # key: (size, data)
+        self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, filename, options=()):
+        filename = os.path.abspath(filename)
+        st = os.stat(filename)
+        return (filename, st.st_size, st.st_mtime_ns, options)
+
+    def load(self, key):
+        """Return the cached data, or None if it isn't there."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def store(self, key, data):
+        if not self.max_size:
+            return
+        size = data_size(data)
+        if size > self.max_size:
+            return
+        self.drop(key)
+        self.entries[key] = (size, data)
+        self.size += size
+        self.evict()
+
+    def drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[0]
+
+    def evict(self):
+        """Drop the least recently used entries until the cache fits."""
+        while self.size > self.max_size:
+            _, (size, _) = self.entries.popitem(last=False)
+            self.size -= size
+
+    def invalidate(self, filename=None):
+        """Forget every version of a file, or everything."""
+        if filename is None:
+            self.clear()
+            return
+        filename = os.path.abspath(filename)
+        for key in [k for k in self.entries if k[0] == filename]:
+            self.drop(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+# Shared by every import in this Blender session.
+session_cache = lwoSessionCache()
@@ -0,0 +1,417 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import os
+import time
+import pickle
+from fnmatch import fnmatch
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .lwoCache import default_cache_dir
+
+# Change this when the saved data changes shape, so old files are ignored.
+IMAGE_CACHE_VERSION = 4
+IMAGE_CACHE = "images.pickle"
+MAX_LISTINGS = 200000  # Directories
+MAX_MODELS = 1000
+# Directories changed this recently may change again within the same mtime,
+# so their listings, and images not found in them, aren't kept.
+MTIME_SLACK = 2
+# Only files of these types are indexed, along with the types of the images
+# being looked for.
+DEFAULT_IMAGE_EXTENSIONS = (
+    ".bmp",
+    ".dds",
+    ".dpx",
+    ".exr",
+    ".gif",
+    ".hdr",
+    ".iff",
+    ".jp2",
+    ".jpeg",
+    ".jpg",
+    ".pic",
+    ".png",
+    ".psd",
+    ".rgb",
+    ".sgi",
+    ".tga",
+    ".tif",
+    ".tiff",
+    ".webp",
+)
+
+
+def dir_mtime(path):
+    """The mtime of a directory, or None if it can't be read."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def settled(mtime):
+    """If a directory with this mtime is unlikely to change within it."""
+    return mtime is None or time.time() - mtime / 1e9 >= MTIME_SLACK
+
+
+def image_key(name):
+    """File names are matched without regard to case, LightWave ran on
+    Windows."""
+    return name.lower()
+
+
+def image_extension(name):
+    return os.path.splitext(name)[1].lower()
+
+
+def extension_list(extensions):
+    """Tidy up "png", "*.PNG" and ".png" into ".png"."""
+    tidy = []
+    for ext in extensions:
+        ext = ext.strip().lstrip("*").lower()
+        if ext and not ext.startswith("."):
+            ext = "." + ext
+        if ext:
+            tidy.append(ext)
+    return tuple(sorted(set(tidy)))
+
+
+class lwoImageIndex:
+    """The files under some search paths, by their lower case name.
+
+    Each search path is walked once, breadth first, and each directory is
+    only read once however many search paths reach it.  When a name is
+    found more than once, find() gives the one from the earliest search
+    path, then the shallowest, then the first in name order.
+
+    listings, if given, holds directory listings from earlier walks, by
+    real path.  They are used again while the directory's mtime is the same.
+    max_depth limits how many levels of folders are walked below a search
+    path, 0 for no limit.  Files and folders matching an ignore glob are
+    left out, and files without one of the extensions, if given.  The
+    folders of each level are read on the threads of pool, if given.
+    """
+
+    def __init__(
+        self, listings=None, max_depth=0, ignore=(), extensions=None, pool=None
+    ):
+        self.files = {}  # image_key(name): [paths, best first]
+        self.dirs = {}  # Real path: mtime, of the directories read
+        self.listings = listings
+        self.max_depth = max_depth
+        self.ignore = tuple(ignore)
+        self.extensions = None if extensions is None else set(extensions)
+        self.pool = pool
+        self.changed = False  # If listings has new entries
+
+    def add_root(self, root, recursive=True, wanted=None):
+        """Add the files in root, and below it if recursive.
+
+        With wanted, a set of image keys, the walk stops at the end of the
+        first level of folders by which they have all been found.
+        """
+        level = [root]
+        depth = 0
+        while level:
+            subdirs = self.add_dirs(level)
+            if wanted is not None and all(key in self.files for key in wanted):
+                break
+            depth += 1
+            if not recursive or 0 < self.max_depth < depth:
+                break
+            level = subdirs
+
+    def add_dirs(self, dirpaths):
+        """Add the files in some directories, and return their
+        subdirectories."""
+        if self.pool is not None and len(dirpaths) > 1:
+            read = list(self.pool.map(self.read_dir, dirpaths))
+        else:
+            read = [self.read_dir(dirpath) for dirpath in dirpaths]
+
+        subdirs = []
+        for dirpath, (realpath, listing) in zip(dirpaths, read):
+            if realpath in self.dirs or listing is None:
+                continue  # Read already, gone, or not allowed in.
+            self.dirs[realpath] = listing[0]
+            self.keep(realpath, listing)
+
+            _, files, dirs = listing
+            for name in files:
+                if self.use_file(name):
+                    path = os.path.join(dirpath, name)
+                    self.files.setdefault(image_key(name), []).append(path)
+            for name in dirs:
+                if not self.ignored(name):
+                    subdirs.append(os.path.join(dirpath, name))
+        return subdirs
+
+    def ignored(self, name):
+        return any(fnmatch(name, pattern) for pattern in self.ignore)
+
+    def use_file(self, name):
+        if self.extensions is not None:
+            if image_extension(name) not in self.extensions:
+                return False
+        return not self.ignored(name)
+
+    def read_dir(self, dirpath):
+        """Return the real path and listing of a directory, this runs on the
+        pool's threads so leaves the index alone."""
+        realpath = os.path.realpath(dirpath)
+        if realpath in self.dirs:
+            return realpath, None
+        return realpath, self.listing(realpath)
+
+    def listing(self, realpath):
+        """The mtime, files and subdirectories of a directory, or None."""
+        mtime = dir_mtime(realpath)
+        if mtime is None:
+            return None
+        if self.listings is not None:
+            listing = self.listings.get(realpath)
+            if listing is not None and listing[0] == mtime:
+                return listing
+
+        try:
+            with os.scandir(realpath) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return None
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            # Hidden files and folders are left out, as glob does.
+            if entry.name.startswith("."):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                subdirs.append(entry.name)
+            else:
+                files.append(entry.name)
+        return (mtime, files, subdirs)
+
+    def keep(self, realpath, listing):
+        """Keep a new listing, or mark an old one as used."""
+        if self.listings is None:
+            return
+        if self.listings.get(realpath) is listing:
+            self.listings.move_to_end(realpath)
+        elif settled(listing[0]):
+            self.listings[realpath] = listing
+            self.changed = True
+
+    def find(self, name):
+        """The path of the file called name, or None."""
+        paths = self.files.get(image_key(name))
+        return paths[0] if paths else None
+
+
+class lwoImageCache:
+    """Directory listings and image lookups kept from one import to the next.
+
+    The listings save reading unchanged directories again.  The file found
+    for each of a model's images is used again while it is still there, no
+    search path ahead of its own is new and the search options are the
+    same.  An image that wasn't found isn't looked for again until one of
+    the directories searched for it changes, or the search options do.
+    With a filename, all this is kept on disk for the next session too.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.listings = OrderedDict()  # Real path: (mtime, files, subdirs)
+        # Model: {image_key(name): (path, root, searched, scope, dirs)}, with
+        # path None and dirs the searched directories' mtimes if not found.
+        self.models = OrderedDict()
+        self.loaded = filename is None
+        self.changed = False  # If there is anything new to save
+
+    def resolve(
+        self,
+        model,
+        names,
+        roots,
+        recursive=True,
+        max_depth=0,
+        ignore=(),
+        extensions=DEFAULT_IMAGE_EXTENSIONS,
+        threads=1,
+    ):
+        """Find the images called names for a model, under the search paths
+        in roots.  Returns {name: path or None}.
+
+        The search stops as soon as every name has been found.  threads is
+        how many directories are read at once, 0 for the thread pool's
+        default.
+        """
+        self.load()
+        roots = [os.path.abspath(root) for root in roots]
+        if extensions is not None:
+            extensions = extension_list(extensions)
+        scope = (recursive, max_depth, tuple(ignore), extensions)
+        known = self.models.pop(model, {})
+        self.models[model] = known
+
+        found = {}
+        todo = []
+        for name in names:
+            lookup = self.cached(known.get(image_key(name)), roots, scope)
+            if lookup is None:
+                todo.append(name)
+            else:
+                found[name] = lookup[0]
+        if not todo:
+            return found
+
+        if extensions is not None:
+            # Whatever the images being looked for are, they are wanted.
+            extensions = set(extensions) | {image_extension(n) for n in todo}
+        pool = ThreadPoolExecutor(threads or None) if threads != 1 else None
+        try:
+            found_in, dirs = self.search(
+                todo, roots, recursive, max_depth, ignore, extensions, pool
+            )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        # The missing images were looked for in every directory read.
+        missing = tuple(sorted(dirs.items()))
+        for name in todo:
+            key = image_key(name)
+            path, root = found_in.get(name, (None, None))
+            if path is not None:
+                lookup = (path, root, tuple(roots), scope, None)
+            elif all(settled(mtime) for _, mtime in missing):
+                lookup = (None, None, tuple(roots), scope, missing)
+            else:
+                lookup = None
+            if known.get(key) != lookup:
+                if lookup is None:
+                    del known[key]
+                else:
+                    known[key] = lookup
+                self.changed = True
+            found[name] = path
+
+        self.trim()
+        self.save()
+        return found
+
+    def search(self, names, roots, recursive, max_depth, ignore, extensions, pool):
+        """Walk the roots in order for names.  Returns {name: (path, root)}
+        for those found, and {real path: mtime} of the directories read,
+        with None for roots that couldn't be."""
+        found_in = {}
+        dirs = {}
+        for root in roots:
+            names = [n for n in names if n not in found_in]
+            if not names:
+                break
+            index = lwoImageIndex(self.listings, max_depth, ignore, extensions, pool)
+            index.add_root(root, recursive, {image_key(n) for n in names})
+            self.changed |= index.changed
+            dirs.setdefault(os.path.realpath(root), None)
+            dirs.update(index.dirs)
+            for name in names:
+                path = index.find(name)
+                if path is not None:
+                    found_in[name] = (path, root)
+        return found_in, dirs
+
+    def cached(self, lookup, roots, scope):
+        """An image's lookup from before, if it can be used again."""
+        if lookup is None or lookup[3] != scope:
+            return None
+        path, root, searched, _, dirs = lookup
+        if path is None:
+            # Still missing if none of the directories it wasn't in changed.
+            if not set(roots) <= set(searched):
+                return None
+            unchanged = all(dir_mtime(d) == mtime for d, mtime in dirs)
+            return lookup if unchanged else None
+        if root not in roots:
+            return None
+        # A search path ahead of the one it was found in is new.
+        if not set(roots[: roots.index(root)]) <= set(searched):
+            return None
+        return lookup if os.path.isfile(path) else None
+
+    def trim(self):
+        while len(self.listings) > MAX_LISTINGS:
+            self.listings.popitem(last=False)
+            self.changed = True
+        while len(self.models) > MAX_MODELS:
+            self.models.popitem(last=False)
+            self.changed = True
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.filename, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as err:
+            print(f"Ignoring unreadable image cache {self.filename}: {err}")
+            return
+        if data.get("version") == IMAGE_CACHE_VERSION:
+            self.listings = data["listings"]
+            self.models = data["models"]
+
+    def save(self):
+        """Write the cache out, if anything in it has changed."""
+        if self.filename is None or not self.changed:
+            return
+        self.changed = False
+        data = {
+            "version": IMAGE_CACHE_VERSION,
+            "listings": self.listings,
+            "models": self.models,
+        }
+        tmp = f"{self.filename}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(tmp, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.filename)
+        except OSError as err:
+            print(f"Could not write image cache {self.filename}: {err}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def clear(self):
+        """Forget everything, on disk too."""
+        self.listings = OrderedDict()
+        self.models = OrderedDict()
+        self.loaded = True
+        self.changed = False
+        if self.filename is not None and os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+# Shared by every import, and kept for the next session.
+image_cache = lwoImageCache(os.path.join(default_cache_dir(), IMAGE_CACHE))
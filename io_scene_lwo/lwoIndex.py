@@ -0,0 +1,273 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import os
+import struct
+from types import SimpleNamespace
+from .chunk import Chunk
+from .lwoObject import (
+    lwoObject,
+    lwoUnsupportedFileException,
+    _choices,
+    _lwo_base,
+    _obj_layer,
+    open_lwo,
+    read_clip,
+    read_lwostring,
+    read_surf_5,
+    read_tags,
+)
+
+# Chunks whose first four bytes give the kind of data in them, LWOB
+# POLS chunks don't.
+SUBTYPED_CHUNKS = (b"VMAP", b"VMAD", b"POLS", b"PTAG")
+# Chunks that belong to the layer before them.
+LAYER_CHUNKS = (
+    b"LAYR",
+    b"PNTS",
+    b"BBOX",
+    b"VMAP",
+    b"VMAD",
+    b"POLS",
+    b"PCHS",
+    b"PTAG",
+)
+
+
+class _lwo_chunk(_lwo_base):
+    """Where a root chunk is, offset is the start of its data in the file."""
+
+    __slots__ = (
+        "name",
+        "subtype",
+        "offset",
+        "size",
+        "layer",
+    )
+
+    def __init__(self, name, offset, size, layer):
+        self.name = name
+        self.subtype = None
+        self.offset = offset
+        self.size = size
+        self.layer = layer  # Position in lwoIndex.layers, -1 for no layer
+
+
+class _lwo_index_layer(_lwo_base):
+    __slots__ = (
+        "name",
+        "index",
+        "parent_index",
+        "pivot",
+        "hidden",
+        "bbox",
+        "chunks",
+    )
+
+    def __init__(self):
+        self.name = ""
+        self.index = -1
+        self.parent_index = -1
+        self.pivot = [0, 0, 0]
+        self.hidden = False
+        self.bbox = None  # [min, max], with Y and Z swapped like the pivot
+        self.chunks = []  # Positions in lwoIndex.chunks
+
+
+class lwoIndex:
+    """A table of contents of an LWO file.
+
+    read() only looks at the chunk headers, and decodes the small TAGS,
+    LAYR, BBOX and CLIP chunks and the SURF names (LWOB surfaces are read
+    whole, as they hold the image names).  The other chunks can
+    then be read one layer at a time with read_layer().
+    """
+
+    def __init__(self, filename):
+        self.name, self.ext = os.path.splitext(os.path.basename(filename))
+        self.filename = os.path.abspath(filename)
+        self.format = None
+        self.chunks = []
+        self.layers = []
+        self.tags = []
+        self.clips = {}
+        self.surf_names = []
+        self.use_mmap = True
+
+    def read(self):
+        with open_lwo(self.filename, self.use_mmap) as f:
+            try:
+                header, chunk_size, self.format = struct.unpack(">4s1L4s", f.read(12))
+            except struct.error:
+                msg = "Error parsing file header! Filename {}".format(self.filename)
+                raise lwoUnsupportedFileException(msg) from None
+            if header != b"FORM" or self.format not in (b"LWO2", b"LWOB", b"LWLO"):
+                msg = "Invalid LWO File Type: {}".format(self.filename)
+                raise lwoUnsupportedFileException(msg)
+
+            while True:
+                try:
+                    rootchunk = Chunk(f)
+                except EOFError:
+                    break
+                self.add_chunk(rootchunk)
+                rootchunk.skip()
+
+    def add_chunk(self, rootchunk):
+        name = rootchunk.chunkname
+        if name == b"LAYR":
+            self.layers.append(_lwo_index_layer())
+        elif name == b"PNTS" and len(self.layers) == 0 and self.format != b"LWO2":
+            # LWOB files have no LAYR chunk to set this up.
+            layer = _lwo_index_layer()
+            layer.name = "Layer 1"
+            self.layers.append(layer)
+
+        layer = len(self.layers) - 1 if name in LAYER_CHUNKS else -1
+        entry = _lwo_chunk(name, rootchunk.offset, rootchunk.chunksize, layer)
+        if name in SUBTYPED_CHUNKS and not (name == b"POLS" and self.format != b"LWO2"):
+            entry.subtype = bytes(rootchunk.read(4))
+        self.chunks.append(entry)
+        if entry.layer >= 0:
+            self.layers[-1].chunks.append(len(self.chunks) - 1)
+
+        if name == b"TAGS" or name == b"SRFS":
+            read_tags(rootchunk.read(), self)
+        elif name == b"LAYR":
+            self.read_layr(rootchunk.read())
+        elif name == b"BBOX" and entry.layer >= 0:
+            bbox = struct.unpack(">6f", rootchunk.read(24))
+            self.layers[-1].bbox = [
+                [bbox[0], bbox[2], bbox[1]],
+                [bbox[3], bbox[5], bbox[4]],
+            ]
+        elif name == b"CLIP":
+            read_clip(rootchunk.read(), self)
+        elif name == b"SURF" and self.format == b"LWO2":
+            surf_name, _ = read_lwostring(rootchunk.read())
+            self.surf_names.append(surf_name or "Default")
+        elif name == b"SURF":
+            # LWOB images are only named in the surfaces, read them whole.
+            lwo = SimpleNamespace(surfs={}, clips=self.clips)
+            read_surf_5(rootchunk.read(), lwo)
+            self.surf_names.extend(lwo.surfs)
+
+    def read_layr(self, layr_bytes):
+        layer = self.layers[-1]
+        layer.index, flags = struct.unpack(">HH", layr_bytes[0:4])
+        if self.format != b"LWO2":
+            name, name_end = read_lwostring(layr_bytes, 4)
+            if name_end - 4 > 2 and name != "noname":
+                layer.name = name
+            else:
+                layer.name = "Layer {}".format(layer.index)
+            return
+
+        layer.hidden = flags > 0
+        pivot = struct.unpack(">fff", layr_bytes[4:16])
+        layer.pivot = [pivot[0], pivot[2], pivot[1]]
+        name, offset = read_lwostring(layr_bytes, 16)
+        layer.name = name if name else "Layer %d" % (layer.index + 1)
+        if len(layr_bytes) == offset + 2:
+            (layer.parent_index,) = struct.unpack(">h", layr_bytes[offset : offset + 2])
+
+    def layer_chunks(self, n, chunknames=None):
+        """The chunks of layer n, or just the ones with the given names."""
+        chunks = [self.chunks[i] for i in self.layers[n].chunks]
+        if chunknames is not None:
+            chunks = [c for c in chunks if c.name in chunknames]
+        return chunks
+
+    def read_chunk(self, entry):
+        """Read the data of a chunk, including any subtype."""
+        with open_lwo(self.filename, self.use_mmap) as f:
+            f.seek(entry.offset - 8)
+            return Chunk(f).read()
+
+    def layer_groups(self, ch):
+        """Split the layers into runs that can be read apart from each other.
+
+        The VMAD and PTAG chunks of a layer that come before its first POLS
+        chunk use the polygon count left by the layer read before it, so
+        that layer is read along with it.  Layers that won't be read are
+        kept with the layer before them too.  Returns None if the file has
+        to be read in order.
+        """
+        first_layr = next(
+            (i for i, entry in enumerate(self.chunks) if entry.name == b"LAYR"),
+            len(self.chunks),
+        )
+        for i, entry in enumerate(self.chunks):
+            if entry.layer < 0 and entry.name in LAYER_CHUNKS:
+                return None  # Layer data before the first layer.
+            if entry.name in (b"TAGS", b"SRFS") and i > first_layr:
+                return None  # Bone tags read before these would miss them.
+
+        groups = []
+        for n, layer in enumerate(self.layers):
+            read = (ch.load_hidden or not layer.hidden) and ch.use_layer(layer)
+            independent = read
+            for entry in self.layer_chunks(n, (b"POLS", b"VMAD", b"PTAG")):
+                independent = read and entry.name == b"POLS"
+                break
+            if independent or not groups:
+                groups.append([n])
+            else:
+                groups[-1].append(n)
+        return groups
+
+    def read_layer(self, n, chunknames=None, ch=None):
+        """Read layer n, or just its chunks with the given names.
+
+        Returns the layer as lwoObject.read() would have made it.  ch holds
+        the import options, by default hidden layers are read too.
+        """
+        layers = self.read_layers([n], chunknames, ch)
+        # A hidden layer isn't read unless ch allows it.
+        return layers[-1] if layers else None
+
+    def read_layers(self, ns, chunknames=None, ch=None):
+        """Read the layers numbered in ns one after another, as read_layer()
+        does, and return the ones that were read."""
+        lwo = lwoObject(self.filename)
+        lwo.ch = _choices(LOAD_HIDDEN=True) if ch is None else ch
+        lwo.tags = self.tags
+        lwo.handle_layer = True
+        lwo.last_pols_count = 0
+        lwo.just_read_bones = False
+        chunks = [entry for n in ns for entry in self.layer_chunks(n)]
+        if self.format == b"LWO2":
+            read_chunk = lwo.read_lwo2_chunk
+        else:
+            read_chunk = lwo.read_lwob_chunk
+            if chunks[0].name != b"LAYR":
+                # A LWOB file without layers, set it up as read_lwob does.
+                nlayer = _obj_layer()
+                nlayer.name = "Layer 1"
+                lwo.layers.append(nlayer)
+
+        with open_lwo(self.filename, self.use_mmap) as f:
+            for entry in chunks:
+                # The LAYR chunk is always needed to set up the layer.
+                if chunknames is not None and entry.name != b"LAYR":
+                    if entry.name not in chunknames:
+                        continue
+                f.seek(entry.offset - 8)
+                read_chunk(Chunk(f))
+
+        return lwo.layers
@@ -19,12 +19,21 @@
 import os
 import struct
 import re
-from glob import glob
+import copy
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
 from collections import OrderedDict
-from .chunk import Chunk
+import numpy as np
+from .chunk import Chunk, BufferFile, ChunkReader, MappedFile, DEFAULT_QUEUE_DEPTH
+from .lwoCache import lwoCache, DEFAULT_CACHE_SIZE, session_cache
+from .lwoImages import lwoImageCache, image_cache, DEFAULT_IMAGE_EXTENSIONS
 
 DEBUG = False
+# POLS, VMAP and VMAD chunks bigger than this many bytes are decoded in
+# slices on several threads, 0 turns that off.
+DEFAULT_SPLIT_CHUNK_SIZE = 16 * 1024 ** 2
 
 
 class lwoNoImageFoundException(Exception):
@@ -35,6 +44,186 @@ class lwoUnsupportedFileException(Exception):
     pass
 
 
+class _choices:
+    __slots__ = (
+        "add_subd_mod",
+        "load_hidden",
+        "skel_to_arm",
+        "use_existing_materials",
+        "layers",
+        "load_morphs",
+        "load_vertex_colors",
+        "load_weights",
+        "load_normals",
+        "use_cache",
+        "use_session_cache",
+        "layer_threads",
+        "read_ahead",
+        "queue_depth",
+        "split_chunk_size",
+        "stream",
+        "cache_images",
+        "cache_dir",
+        "cache_size",
+        "search_paths",
+        "cancel_search",
+        "images",
+        "recursive",
+        "search_depth",
+        "search_ignore",
+        "image_extensions",
+        "search_threads",
+        "loaded_images",
+        "share_materials",
+    )
+
+    def __init__(
+        self,
+        ADD_SUBD_MOD=True,
+        LOAD_HIDDEN=False,
+        SKEL_TO_ARM=True,
+        USE_EXISTING_MATERIALS=False,
+        LAYERS=None,
+        LOAD_MORPHS=True,
+        LOAD_VERTEX_COLORS=True,
+        LOAD_WEIGHTS=True,
+        LOAD_NORMALS=True,
+        USE_CACHE=False,
+        USE_SESSION_CACHE=True,
+        LAYER_THREADS=0,
+        READ_AHEAD=0,
+        QUEUE_DEPTH=DEFAULT_QUEUE_DEPTH,
+        SPLIT_CHUNK_SIZE=DEFAULT_SPLIT_CHUNK_SIZE,
+        STREAM=False,
+        CACHE_IMAGES=True,
+        SEARCH_DEPTH=0,
+        SEARCH_IGNORE=None,
+        IMAGE_EXTENSIONS=DEFAULT_IMAGE_EXTENSIONS,
+        SEARCH_THREADS=0,
+        SHARE_MATERIALS=False,
+    ):
+        self.add_subd_mod = ADD_SUBD_MOD
+        self.load_hidden = LOAD_HIDDEN
+        self.skel_to_arm = SKEL_TO_ARM
+        self.use_existing_materials = USE_EXISTING_MATERIALS
+        # Layer indexes (as in the file) or names, all layers when empty.
+        self.layers = [] if LAYERS is None else list(LAYERS)
+        self.load_morphs = LOAD_MORPHS
+        self.load_vertex_colors = LOAD_VERTEX_COLORS
+        self.load_weights = LOAD_WEIGHTS
+        self.load_normals = LOAD_NORMALS
+        self.use_cache = USE_CACHE
+        self.use_session_cache = USE_SESSION_CACHE
+        # Threads to read the layers of a file with, 0 for one per CPU core.
+        self.layer_threads = LAYER_THREADS
+        # Bytes to read at a time on a thread of its own, 0 reads as the
+        # chunks are decoded.  Meant for slow network storage.
+        self.read_ahead = READ_AHEAD
+        self.queue_depth = QUEUE_DEPTH  # Chunks read ahead at most
+        # Bytes above which a chunk is decoded in slices on several threads,
+        # 0 decodes every chunk on the thread reading it.
+        self.split_chunk_size = SPLIT_CHUNK_SIZE
+        # Build each layer as soon as it is read, and let go of it.
+        self.stream = STREAM
+        # Keep the image search results and directory listings for next time.
+        self.cache_images = CACHE_IMAGES
+        self.cache_dir = None  # Blender's user cache directory
+        self.cache_size = DEFAULT_CACHE_SIZE
+        self.search_paths = []
+        self.cancel_search = False
+        self.images = {}
+        self.recursive = True
+        # Folder levels to search below each search path, 0 for no limit.
+        self.search_depth = SEARCH_DEPTH
+        # Globs of the files and folders to leave out of the image search.
+        self.search_ignore = [] if SEARCH_IGNORE is None else list(SEARCH_IGNORE)
+        # The image file types to look at, None for any file.
+        self.image_extensions = IMAGE_EXTENSIONS
+        # Folders to read at once, 0 for the thread pool's default.
+        self.search_threads = SEARCH_THREADS
+        # The images loaded by the import, by absolute path.
+        self.loaded_images = {}
+        # Use one material for equal surfaces, in this import and earlier ones.
+        self.share_materials = SHARE_MATERIALS
+
+    def parse_options(self):
+        """The options that change what is read from a file."""
+        return (
+            self.load_hidden,
+            self.skel_to_arm,
+            tuple(self.layers),
+            self.load_morphs,
+            self.load_vertex_colors,
+            self.load_weights,
+            self.load_normals,
+        )
+
+    def use_layer(self, layer):
+        """Is the layer one of the chosen ones."""
+        if not self.layers:
+            return True
+        return layer.index in self.layers or layer.name in self.layers
+
+    def use_map(self, chunkname, map_type):
+        """Should a VMAP or VMAD chunk of this type be read."""
+        if map_type == b"MORF" or map_type == b"SPOT":
+            return self.load_morphs
+        elif map_type == b"RGB " or map_type == b"RGBA":
+            return self.load_vertex_colors
+        elif map_type == b"NORM":
+            return self.load_normals
+        elif map_type == b"WGHT" and chunkname == b"VMAP":
+            # The VMAD weights are the subpatch edge weights.
+            return self.load_weights
+        return True
+
+
+def _equal(a, b):
+    """Compare two parsed values, which may be numpy arrays."""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b
+
+
+def _plain(value):
+    """A parsed value as plain Python types, which repr() the same however
+    it was read."""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return tuple(_plain(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _texture_values(texture, skip):
+    """The settings of a texture, with its image as an absolute path.  skip
+    names the slots that only mean something inside the file."""
+    values = []
+    for k in dict.fromkeys(texture.__slots__):
+        if k in skip:
+            continue
+        value = getattr(texture, k)
+        if k == "image" and value is not None:
+            value = os.path.normcase(os.path.abspath(value))
+        values.append((k, _plain(value)))
+    return values
+
+
+def _keep_last(keys, *arrays):
+    """Keep only the last entry for each key, sorted by key.
+
+    This gives the same result as filling a dict in order.
+    """
+    if len(keys) < 2 or np.all(keys[1:] > keys[:-1]):
+        return (keys,) + arrays
+    reverse = keys[::-1]
+    keys, first = np.unique(reverse, return_index=True)
+    last = len(reverse) - 1 - first
+    return (keys,) + tuple(a[last] for a in arrays)
+
+
 class _lwo_base:
     def __eq__(self, x):
         if not isinstance(x, self.__class__):
@@ -42,7 +231,7 @@ class _lwo_base:
         for k in self.__slots__:
             a = getattr(self, k)
             b = getattr(x, k)
-            if not a == b:
+            if not _equal(a, b):
                 print(f"{k} mismatch:")
                 print(f"\t{a} != {b}")
                 return False
@@ -78,7 +267,8 @@ class _obj_layer(_lwo_base):
         "uvmaps_vmap",
         "morphs",
         "edge_weights",
-        "surf_tags",
+        "surf_ids",
+        "surf_keys",
         "has_subds",
     )
 
@@ -87,23 +277,219 @@ class _obj_layer(_lwo_base):
         self.index = -1
         self.parent_index = -1
         self.pivot = [0, 0, 0]
-        self.pols = []
+        self.pols = _obj_pols()
         self.bones = []
         self.bone_names = {}
         self.bone_rolls = {}
-        self.pnts = []
-        self.vnorms = {}
-        self.lnorms = {}
+        self.pnts = np.empty((0, 3), dtype=np.float32)
+        self.vnorms = _obj_vmap.empty(3)
+        self.lnorms = _obj_vmad.empty(3)
         self.wmaps = {}
         self.colmaps = {}
         self.uvmaps_vmad = {}
         self.uvmaps_vmap = {}
         self.morphs = {}
-        self.edge_weights = {}
-        self.surf_tags = {}
+        self.edge_weights = _obj_edge_weights.empty()
+        self.surf_ids = np.empty(0, dtype=np.int32)  # -1 is unassigned
+        self.surf_keys = []  # Used surfaces, in the order first seen
         self.has_subds = False
 
 
+class _obj_pols(_lwo_base):
+    """Polygons in CSR form, the points of polygon i are
+    indices[offsets[i]:offsets[i + 1]]."""
+
+    __slots__ = (
+        "indices",
+        "offsets",
+    )
+
+    def __init__(self):
+        self.indices = np.empty(0, dtype=np.int32)
+        self.offsets = np.zeros(1, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return self.indices[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def find_corners(self, pol_ids, pnt_ids):
+        """Find where each polygon's point is in indices.
+
+        A point used twice by a polygon gives its first position, and -1 is
+        given where the polygon doesn't use the point.
+        """
+        loops = np.full(len(pol_ids), -1, dtype=np.int64)
+        valid = np.flatnonzero((pol_ids >= 0) & (pol_ids < len(self)))
+        if len(valid) == 0:
+            return loops
+
+        owner = np.repeat(np.arange(len(self), dtype=np.int64), self.counts)
+        keys, first = np.unique(_corner_keys(owner, self.indices), return_index=True)
+        wanted = _corner_keys(pol_ids[valid], pnt_ids[valid])
+        rows = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+        found = keys[rows] == wanted
+        loops[valid[found]] = first[rows[found]]
+        return loops
+
+    def extend(self, indices, offsets):
+        """Append polygons given in CSR form, with offsets starting at 0."""
+        self.indices = np.concatenate((self.indices, indices))
+        self.offsets = np.concatenate((self.offsets, offsets[1:] + self.offsets[-1]))
+
+
+class _obj_vmap(_lwo_base):
+    """Sparse per-point map, values[i] belongs to point pnt_ids[i].
+
+    The point ids are kept sorted and unique.
+    """
+
+    __slots__ = (
+        "pnt_ids",
+        "values",
+    )
+
+    def __init__(self, pnt_ids, values):
+        self.pnt_ids, self.values = _keep_last(pnt_ids, values)
+
+    @classmethod
+    def empty(cls, dim):
+        return cls(np.empty(0, dtype=np.int32), np.empty((0, dim), dtype=np.float32))
+
+    def __len__(self):
+        return len(self.pnt_ids)
+
+    def update(self, other):
+        """Merge in a later map, its values win as with dict.update."""
+        self.pnt_ids, self.values = _keep_last(
+            np.concatenate((self.pnt_ids, other.pnt_ids)),
+            np.concatenate((self.values, other.values)),
+        )
+
+
+class _obj_morph(_lwo_base):
+    """An endomorph, values[i] is the displacement of point pnt_ids[i],
+    or its position when is_abs is set."""
+
+    __slots__ = (
+        "pnt_ids",
+        "values",
+        "is_abs",
+    )
+
+    def __init__(self, vmap, is_abs):
+        self.pnt_ids = vmap.pnt_ids
+        self.values = vmap.values
+        self.is_abs = is_abs
+
+    def __len__(self):
+        return len(self.pnt_ids)
+
+    def update(self, other):
+        """Merge in a later morph of the same kind, its values win."""
+        self.pnt_ids, self.values = _keep_last(
+            np.concatenate((self.pnt_ids, other.pnt_ids)),
+            np.concatenate((self.values, other.values)),
+        )
+
+    def positions(self, pnts):
+        """The morphed positions of the points in pnt_ids."""
+        if self.is_abs:
+            return self.values
+        base = pnts[self.pnt_ids].astype(np.float64)
+        return (base + self.values).astype(np.float32)
+
+
+def _corner_keys(pol_ids, pnt_ids):
+    """Pack polygon and point ids into one sortable int64 key."""
+    return (pol_ids.astype(np.int64) << 32) | pnt_ids.astype(np.int64)
+
+
+class _obj_vmad(_lwo_base):
+    """Sparse per-polygon map, values[i] belongs to point pnt_ids[i] of
+    polygon pol_ids[i].
+
+    The polygon ids are absolute and the entries are kept sorted by
+    polygon, then point.
+    """
+
+    __slots__ = (
+        "pnt_ids",
+        "pol_ids",
+        "values",
+    )
+
+    def __init__(self, pnt_ids, pol_ids, values):
+        keys, self.values = _keep_last(_corner_keys(pol_ids, pnt_ids), values)
+        self.pol_ids = (keys >> 32).astype(np.int32)
+        self.pnt_ids = (keys & 0xFFFFFFFF).astype(np.int32)
+
+    @classmethod
+    def empty(cls, dim):
+        ids = np.empty(0, dtype=np.int32)
+        return cls(ids, ids, np.empty((0, dim), dtype=np.float32))
+
+    def __len__(self):
+        return len(self.pnt_ids)
+
+    @property
+    def keys(self):
+        return _corner_keys(self.pol_ids, self.pnt_ids)
+
+    def update(self, other):
+        """Merge in a later map.  As dict.update did with the per-polygon
+        dicts, a polygon in the later map replaces all its earlier values."""
+        keep = ~np.isin(self.pol_ids, other.pol_ids)
+        merged = _obj_vmad(
+            np.concatenate((self.pnt_ids[keep], other.pnt_ids)),
+            np.concatenate((self.pol_ids[keep], other.pol_ids)),
+            np.concatenate((self.values[keep], other.values)),
+        )
+        self.pnt_ids, self.pol_ids, self.values = (
+            merged.pnt_ids,
+            merged.pol_ids,
+            merged.values,
+        )
+
+
+class _obj_edge_weights(_lwo_base):
+    """Catmull-Clark edge weights, values[i] belongs to the edge between
+    the two points packed in edges[i] as min << 32 | max."""
+
+    __slots__ = (
+        "edges",
+        "values",
+    )
+
+    def __init__(self, edges, values):
+        self.edges, self.values = _keep_last(edges, values)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+
+    def __len__(self):
+        return len(self.edges)
+
+    def update(self, other):
+        """Merge in later weights, they win as with dict.update."""
+        self.edges, self.values = _keep_last(
+            np.concatenate((self.edges, other.edges)),
+            np.concatenate((self.values, other.values)),
+        )
+
+
 class _obj_surf(_lwo_base):
     __slots__ = (
         "name",
@@ -148,6 +534,23 @@ class _obj_surf(_lwo_base):
         self.textures = {}  # Textures list
         self.textures_5 = []  # Textures list for LWOB
 
+    def content_hash(self):
+        """A hash of the surface's settings and the images of its textures,
+        the same for equal surfaces from any file.
+
+        Call it once the clips have been resolved to image paths.
+        """
+        values = []
+        for k in self.__slots__:
+            if k not in ("textures", "textures_5"):
+                values.append((k, _plain(getattr(self, k))))
+        for channel in sorted(self.textures):
+            for texture in self.textures[channel]:
+                values.append((channel, _texture_values(texture, ("clipid",))))
+        for texture in self.textures_5:
+            values.append(("LWOB", _texture_values(texture, ("id",))))
+        return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
     def lwoprint(self):  # debug: no cover
         print("SURFACE")
         print(f"Surface Name:       {self.name}")
@@ -230,21 +633,38 @@ class _surf_texture_5(_lwo_base):
         self.Z = False
 
 
-def read_lwostring(raw_name):
-    """Parse a zero-padded string."""
+def _find_nul(buf, offset):
+    """Find the next NUL at or after offset, without copying the buffer."""
+    if not isinstance(buf, memoryview):
+        i = buf.find(b"\0", offset)
+        return len(buf) if i < 0 else i
+
+    # memoryviews can't search, look at a growing window instead.
+    start = offset
+    step = 64
+    while start < len(buf):
+        i = bytes(buf[start : start + step]).find(b"\0")
+        if i >= 0:
+            return start + i
+        start += step
+        step *= 2
+    return len(buf)
+
+
+def read_lwostring(buf, offset=0):
+    """Parse a zero-padded string starting at offset.
 
-    i = raw_name.find(b"\0")
-    name_len = i + 1
+    Returns the string and the offset just past its padding.
+    """
+    i = _find_nul(buf, offset)
+    name_len = i - offset + 1
     if name_len % 2 == 1:  # Test for oddness.
         name_len += 1
 
-    if i > 0:
-        # Some plugins put non-text strings in the tags chunk.
-        name = raw_name[0:i].decode("utf-8", "ignore")
-    else:
-        name = ""
+    # Some plugins put non-text strings in the tags chunk.
+    name = bytes(buf[offset:i]).decode("utf-8", "ignore")
 
-    return name, name_len
+    return name, offset + name_len
 
 
 def read_vx(pointdata):
@@ -259,14 +679,315 @@ def read_vx(pointdata):
     return index, size
 
 
+class _chunk_splitter:
+    """Decodes big chunks in slices, on one thread pool shared by every
+    read.  Layers read side by side share its threads rather than each
+    starting a pool per chunk, so there are never more than one per core.
+    The split size comes with each chunk, so reads with different options
+    can share it.
+    """
+
+    def __init__(self):
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def threads(self, nbytes, split_size):
+        """How many slices to decode a chunk of nbytes in, 1 if it is no
+        bigger than split_size or split_size is 0."""
+        if split_size <= 0 or nbytes <= split_size:
+            return 1
+        return os.cpu_count() or 1
+
+    def map(self, func, bounds):
+        """Call func(start, end) for each slice between bounds on the pool,
+        and return the results in order."""
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        slices = list(zip(bounds[:-1], bounds[1:]))
+        # The slices never wait on the pool, so a layer thread waiting for
+        # them can't hold it up.
+        return list(self.pool.map(lambda s: func(*s), slices))
+
+
+chunk_splitter = _chunk_splitter()
+
+
+def _balanced_bounds(offsets, pieces):
+    """Split records into pieces with about the same amount of data, offsets
+    being where each record starts in it, and where the last one ends."""
+    bounds = np.searchsorted(offsets, np.linspace(0, offsets[-1], pieces + 1))
+    bounds[0] = 0
+    bounds[-1] = len(offsets) - 1
+    return np.unique(bounds)
+
+
+def _read_vx_words(words):
+    values = words.astype(np.int32)
+    flagged = np.flatnonzero(words >= 0xFF00)
+    if len(flagged) == 0:
+        return values
+
+    run = np.arange(len(flagged))
+    run_start = np.maximum.accumulate(
+        np.where(np.diff(flagged, prepend=-2) != 1, run, 0)
+    )
+    wide = flagged[(run - run_start) % 2 == 0]
+    keep = np.ones(len(words), dtype=bool)
+    if wide[-1] + 1 == len(words):
+        # A four byte index cut short by the end of the chunk.
+        keep[wide[-1]] = False
+        wide = wide[:-1]
+    values[wide] = ((values[wide] & 0xFF) << 16) | values[wide + 1]
+    keep[wide + 1] = False
+    return values[keep]
+
+
+def _vx_cuts(words, pieces):
+    """Where to split words so that each slice starts with an index.
+
+    A word after one below 0xFF00 always starts an index, as it can't be
+    the low word of a four byte index.
+    """
+    cuts = [0]
+    for target in np.linspace(0, len(words), pieces + 1)[1:-1].astype(np.int64):
+        target = max(int(target), cuts[-1] + 1)
+        found = np.flatnonzero(words[target - 1 : target + 4095] < 0xFF00)
+        if len(found) and target + found[0] < len(words):
+            cuts.append(target + int(found[0]))
+    cuts.append(len(words))
+    return cuts
+
+
+def read_vx_array(vx_bytes, split_size=0):
+    """Read a run of variable-length indexes in one pass.
+
+    A U2 word with a high byte of 0xFF starts a four byte index.  The low
+    word of a four byte index may itself look like a start word, so within
+    a run of such words only every other one starts an index.  Runs longer
+    than split_size bytes are read in slices on chunk_splitter.
+    """
+    words = np.frombuffer(vx_bytes, dtype=">u2", count=len(vx_bytes) // 2)
+    threads = chunk_splitter.threads(len(vx_bytes), split_size)
+    if threads < 2:
+        return _read_vx_words(words)
+    cuts = _vx_cuts(words, threads)
+    slices = chunk_splitter.map(lambda a, b: _read_vx_words(words[a:b]), cuts)
+    return np.concatenate(slices)
+
+
+def _pols_heads(values, extra):
+    """Find where each record of a POLS chunk starts."""
+    heads = []
+    view = memoryview(values)
+    total = len(values)
+    pos = 0
+    run = 16
+    while pos < total:
+        # The top six bits of the count are flags.
+        count = view[pos] & 0x3FF
+        stride = count + 1 + extra
+        # Guess that the following records have the same count.  The guess
+        # is exact up to the first record whose count differs.
+        starts = np.arange(pos, min(total, pos + run * stride), stride)
+        differ = np.flatnonzero((values[starts] & 0x3FF) != count)
+        if len(differ):
+            starts = starts[: differ[0]]
+        heads.append(starts)
+        pos += len(starts) * stride
+        if len(differ) == 0:
+            run *= 2
+            continue
+
+        # Mixed polygon sizes, step through a few records one at a time.
+        run = 16
+        stepped = []
+        while pos < total and len(stepped) < 64:
+            stepped.append(pos)
+            pos += (view[pos] & 0x3FF) + 1 + extra
+        heads.append(np.array(stepped, dtype=np.int64))
+    heads = np.concatenate(heads) if heads else np.empty(0, dtype=np.int64)
+    if pos > total:
+        heads = heads[:-1]  # Truncated record
+    return heads
+
+
+def read_pols_array(values, extra=0, split_size=0):
+    """Split a POLS chunk, already read as indexes, into CSR arrays.
+
+    Each record is a point count, that many point indexes and then extra
+    trailing values.  The point order is reversed to correct the normals.
+    Returns the position of each record's count with the CSR arrays.
+    Chunks longer than split_size bytes are filled in slices.
+    """
+    heads = _pols_heads(values, extra)
+    counts = values[heads] & 0x3FF
+    offsets = np.zeros(len(heads) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    indices = np.empty(offsets[-1], dtype=values.dtype)
+
+    def fill(a, b):
+        # Polygon p's last point is at heads[p] + counts[p], walk backwards.
+        src = np.repeat(heads[a:b] + counts[a:b] + offsets[a:b], counts[a:b])
+        src -= np.arange(offsets[a], offsets[b])
+        indices[offsets[a] : offsets[b]] = values[src]
+
+    threads = chunk_splitter.threads(values.nbytes // 2, split_size)
+    if threads < 2:
+        fill(0, len(heads))
+    else:
+        chunk_splitter.map(fill, _balanced_bounds(offsets, threads))
+    return heads, indices, offsets
+
+
+def _gather_vx(words, field):
+    """Read the variable-length indexes at the word positions in field.
+
+    field is moved on past the indexes.
+    """
+    index = words[field].astype(np.int32)
+    wide = np.flatnonzero(index >= 0xFF00)
+    index[wide] = ((index[wide] & 0xFF) << 16) | words[field[wide] + 1]
+    field += 1
+    field[wide] += 1
+    return index
+
+
+def _vx_record_starts(data, pos, end, vx_count, tail):
+    """Find where each record of vx_count indexes and tail words starts,
+    in words.
+
+    A record's length depends on its index widths, so this walks the
+    records like read_pols_array does.
+    """
+    starts = []
+    run = 16
+    while pos < end:
+        # A four byte index starts with a 0xFF byte.
+        widths = []
+        field = pos
+        for _ in range(vx_count):
+            widths.append(2 if field < end and data[2 * field] == 0xFF else 1)
+            field += widths[-1]
+        stride = field - pos + tail
+        if pos + stride > end:
+            break  # Truncated record
+
+        # Guess that the following records have the same widths.  The guess
+        # is exact up to the first record where a width differs.
+        last = min(end - stride, pos + (run - 1) * stride)
+        candidates = np.arange(pos, last + 1, stride)
+        same = np.ones(len(candidates), dtype=bool)
+        field = 0
+        for width in widths:
+            same &= (data[2 * (candidates + field)] == 0xFF) == (width == 2)
+            field += width
+        differ = np.flatnonzero(~same)
+        if len(differ):
+            candidates = candidates[: differ[0]]
+        starts.append(candidates)
+        pos += len(candidates) * stride
+        if len(differ) == 0:
+            run *= 2
+            continue
+
+        # Mixed index widths, step through a few records one at a time.
+        run = 16
+        stepped = []
+        while pos < end and len(stepped) < 64:
+            field = pos
+            for _ in range(vx_count):
+                field += 2 if field < end and data[2 * field] == 0xFF else 1
+            if field + tail > end:
+                pos = end
+                break
+            stepped.append(pos)
+            pos = field + tail
+        starts.append(np.array(stepped, dtype=np.int64))
+    return np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+
+
+def read_vx_records(rec_bytes, offset, vx_count, dim, split_size=0):
+    """Read the records of a VMAP or VMAD body in bulk.
+
+    Each record is vx_count variable-length indexes followed by dim floats,
+    starting at an even offset.  Returns a list of vx_count int32 index
+    arrays and an (N, dim) float32 value array.  Bodies longer than
+    split_size bytes are filled in slices.
+    """
+    words = np.frombuffer(rec_bytes, dtype=">u2", count=len(rec_bytes) // 2)
+    data = np.frombuffer(rec_bytes, dtype=np.uint8, count=2 * len(words))
+    starts = _vx_record_starts(data, offset // 2, len(words), vx_count, 2 * dim)
+
+    indexes = [np.empty(len(starts), dtype=np.int32) for _ in range(vx_count)]
+    values = np.empty((len(starts), dim), dtype=np.float32)
+
+    def fill(a, b):
+        field = starts[a:b].copy()
+        for index in indexes:
+            index[a:b] = _gather_vx(words, field)
+        for i in range(dim):
+            high = words[field + 2 * i].astype(np.uint32)
+            low = words[field + 2 * i + 1]
+            values[a:b, i] = ((high << 16) | low).view(np.float32)
+
+    threads = chunk_splitter.threads(len(rec_bytes), split_size)
+    if threads < 2:
+        fill(0, len(starts))
+    else:
+        bounds = np.linspace(0, len(starts), threads + 1).astype(np.int64)
+        chunk_splitter.map(fill, bounds)
+    return indexes, values
+
+
+def read_ptag_array(tag_bytes):
+    """Read a PTAG body's polygon ids and tag indexes."""
+    words = np.frombuffer(tag_bytes, dtype=">u2", count=len(tag_bytes) // 2)
+    data = np.frombuffer(tag_bytes, dtype=np.uint8, count=2 * len(words))
+    field = _vx_record_starts(data, 0, len(words), 1, 1)
+    pol_ids = _gather_vx(words, field)
+    return pol_ids, words[field].astype(np.int32)
+
+
+def read_vmap_array(vmap_bytes, dim, split_size=0):
+    """Read a VMAP's name and its point ids and (N, dim) values.
+
+    Repeated points keep their last value.
+    """
+    name, offset = read_lwostring(vmap_bytes, 2)
+    (pnt_ids,), values = read_vx_records(vmap_bytes, offset, 1, dim, split_size)
+    return name, _obj_vmap(pnt_ids, values)
+
+
+def read_vmad_array(vmad_bytes, dim, pol_offset=0, split_size=0):
+    """Read a VMAD's name and its point ids, polygon ids and (N, dim) values.
+
+    pol_offset is added to the polygon ids, which can be relative to the
+    last POLS chunk.  Repeated corners keep their last value.
+    """
+    name, offset = read_lwostring(vmad_bytes, 2)
+    (pnt_ids, pol_ids), values = read_vx_records(
+        vmad_bytes, offset, 2, dim, split_size
+    )
+    pol_ids += pol_offset
+    return name, _obj_vmad(pnt_ids, pol_ids, values)
+
+
+def _merge_vmap(maps, name, vmap):
+    """Add a map, merging with an earlier one of the same name."""
+    if name in maps:
+        maps[name].update(vmap)
+    else:
+        maps[name] = vmap
+
+
 def read_tags(tag_bytes, lwo):
     """Read the object's Tags chunk."""
     offset = 0
     chunk_len = len(tag_bytes)
 
     while offset < chunk_len:
-        tag, tag_len = read_lwostring(tag_bytes[offset:])
-        offset += tag_len
+        tag, offset = read_lwostring(tag_bytes, offset)
         lwo.tags.append(tag)
 
 
@@ -284,8 +1005,7 @@ def read_layr(layr_bytes, object_layers, load_hidden):
     # Swap Y and Z to match Blender's pitch.
     new_layr.pivot = [pivot[0], pivot[2], pivot[1]]
     offset += 12
-    layr_name, name_len = read_lwostring(layr_bytes[offset:])
-    offset += name_len
+    layr_name, offset = read_lwostring(layr_bytes, offset)
 
     if layr_name:
         new_layr.name = layr_name
@@ -307,8 +1027,8 @@ def read_layr_5(layr_bytes, object_layers):
 
     print("Reading Object Layer")
     offset = 4
-    layr_name, name_len = read_lwostring(layr_bytes[offset:])
-    offset += name_len
+    layr_name, name_end = read_lwostring(layr_bytes, offset)
+    name_len = name_end - offset
 
     if name_len > 2 and layr_name != "noname":
         new_layr.name = layr_name
@@ -319,336 +1039,203 @@ def read_layr_5(layr_bytes, object_layers):
     object_layers.append(new_layr)
 
 
+def read_pnts_array(pnt_bytes, pivot):
+    """Read points into an (N, 3) float32 array, relative to the pivot."""
+    count = len(pnt_bytes) // 12
+    data = np.frombuffer(pnt_bytes, dtype=">f4", count=count * 3).reshape(count, 3)
+
+    # Re-order the points so that the mesh has the right pitch,
+    # the pivot already has the correct order.  The subtraction is done
+    # in double precision, as it was when the points were python floats.
+    pnts = np.empty((count, 3), dtype=np.float32)
+    for axis, column in enumerate((0, 2, 1)):
+        pnts[:, axis] = data[:, column] - np.float64(pivot[axis])
+    return pnts
+
+
 def read_pnts(pnt_bytes, object_layers):
-    """Read the layer's points."""
+    """Read the layer's points into an (N, 3) float32 array."""
     print(f"\tReading Layer ({object_layers[-1].name }) Points")
-    offset = 0
-    chunk_len = len(pnt_bytes)
-
-    while offset < chunk_len:
-        pnts = struct.unpack(">fff", pnt_bytes[offset : offset + 12])
-        offset += 12
-        # Re-order the points so that the mesh has the right pitch,
-        # the pivot already has the correct order.
-        pnts = [
-            pnts[0] - object_layers[-1].pivot[0],
-            pnts[2] - object_layers[-1].pivot[1],
-            pnts[1] - object_layers[-1].pivot[2],
-        ]
-        object_layers[-1].pnts.append(pnts)
-
-
-def read_weightmap(weight_bytes, object_layers):
-    """Read a weight map's values."""
-    chunk_len = len(weight_bytes)
-    offset = 2
-    name, name_len = read_lwostring(weight_bytes[offset:])
-    offset += name_len
-    weights = []
+    layer = object_layers[-1]
+    pnts = read_pnts_array(pnt_bytes, layer.pivot)
+    if len(layer.pnts):
+        pnts = np.concatenate((layer.pnts, pnts))
+    layer.pnts = pnts
 
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(weight_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        (value,) = struct.unpack(">f", weight_bytes[offset : offset + 4])
-        offset += 4
-        weights.append([pnt_id, value])
 
-    object_layers[-1].wmaps[name] = weights
+def read_weightmap(weight_bytes, object_layers, split_size=0):
+    """Read a weight map's values."""
+    name, weights = read_vmap_array(weight_bytes, 1, split_size)
+    _merge_vmap(object_layers[-1].wmaps, name, weights)
 
 
-def read_morph(morph_bytes, object_layers, is_abs):
+def read_morph(morph_bytes, object_layers, is_abs, split_size=0):
     """Read an endomorph's relative or absolute displacement values."""
-    chunk_len = len(morph_bytes)
-    offset = 2
-    name, name_len = read_lwostring(morph_bytes[offset:])
-    offset += name_len
-    deltas = []
+    name, deltas = read_vmap_array(morph_bytes, 3, split_size)
+    # Swap the Y and Z to match Blender's pitch.
+    deltas.values = np.ascontiguousarray(deltas.values[:, [0, 2, 1]])
 
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(morph_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        pos = struct.unpack(">fff", morph_bytes[offset : offset + 12])
-        offset += 12
-        pnt = object_layers[-1].pnts[pnt_id]
-
-        if is_abs:
-            deltas.append([pnt_id, pos[0], pos[2], pos[1]])
-        else:
-            # Swap the Y and Z to match Blender's pitch.
-            deltas.append([pnt_id, pnt[0] + pos[0], pnt[1] + pos[2], pnt[2] + pos[1]])
+    morph = _obj_morph(deltas, is_abs)
 
-        object_layers[-1].morphs[name] = deltas
+    # A later morph of the other kind replaces the earlier one.
+    morphs = object_layers[-1].morphs
+    if name in morphs and morphs[name].is_abs == is_abs:
+        morphs[name].update(morph)
+    else:
+        morphs[name] = morph
 
 
-def read_colmap(col_bytes, object_layers):
+def read_colmap(col_bytes, object_layers, split_size=0):
     """Read the RGB or RGBA color map."""
-    chunk_len = len(col_bytes)
     (dia,) = struct.unpack(">H", col_bytes[0:2])
-    offset = 2
-    name, name_len = read_lwostring(col_bytes[offset:])
-    offset += name_len
-    colors = {}
-
-    if dia == 3:
-        while offset < chunk_len:
-            pnt_id, pnt_id_len = read_vx(col_bytes[offset : offset + 4])
-            offset += pnt_id_len
-            col = struct.unpack(">fff", col_bytes[offset : offset + 12])
-            offset += 12
-            colors[pnt_id] = (col[0], col[1], col[2])
-    elif dia == 4:
-        while offset < chunk_len:
-            pnt_id, pnt_id_len = read_vx(col_bytes[offset : offset + 4])
-            offset += pnt_id_len
-            col = struct.unpack(">ffff", col_bytes[offset : offset + 16])
-            offset += 16
-            colors[pnt_id] = (col[0], col[1], col[2])
-
-    if name in object_layers[-1].colmaps:
-        if "PointMap" in object_layers[-1].colmaps[name]:
-            object_layers[-1].colmaps[name]["PointMap"].update(colors)
-        else:
-            object_layers[-1].colmaps[name]["PointMap"] = colors
+    if dia not in (3, 4):
+        name, _ = read_lwostring(col_bytes, 2)
+        colors = _obj_vmap.empty(3)
     else:
-        object_layers[-1].colmaps[name] = dict(PointMap=colors)
-
+        name, colors = read_vmap_array(col_bytes, dia, split_size)
+        # Only the RGB part is used.
+        colors.values = np.ascontiguousarray(colors.values[:, :3])
 
-def read_normmap(norm_bytes, object_layers):
-    """Read vertex normal maps."""
-    chunk_len = len(norm_bytes)
-    offset = 2
-    name, name_len = read_lwostring(norm_bytes[offset:])
-    offset += name_len
-    vnorms = {}
+    colmaps = object_layers[-1].colmaps.setdefault(name, {})
+    _merge_vmap(colmaps, "PointMap", colors)
 
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(norm_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        norm = struct.unpack(">fff", norm_bytes[offset : offset + 12])
-        offset += 12
-        vnorms[pnt_id] = [norm[0], norm[2], norm[1]]
 
-    object_layers[-1].vnorms = vnorms
+def read_normmap(norm_bytes, object_layers, split_size=0):
+    """Read vertex normal maps."""
+    _, vnorms = read_vmap_array(norm_bytes, 3, split_size)
+    # Swap Y and Z to match Blender's pitch.
+    vnorms.values = np.ascontiguousarray(vnorms.values[:, [0, 2, 1]])
+    object_layers[-1].vnorms.update(vnorms)
 
 
-def read_color_vmad(col_bytes, object_layers, last_pols_count):
+def read_color_vmad(col_bytes, object_layers, last_pols_count, split_size=0):
     """Read the Discontinuous (per-polygon) RGB values."""
-    chunk_len = len(col_bytes)
     (dia,) = struct.unpack(">H", col_bytes[0:2])
-    offset = 2
-    name, name_len = read_lwostring(col_bytes[offset:])
-    offset += name_len
-    colors = {}
+    # The PolyID in a VMAD can be relative, this offsets it.
     abs_pid = len(object_layers[-1].pols) - last_pols_count
-
-    if dia == 3:
-        while offset < chunk_len:
-            pnt_id, pnt_id_len = read_vx(col_bytes[offset : offset + 4])
-            offset += pnt_id_len
-            pol_id, pol_id_len = read_vx(col_bytes[offset : offset + 4])
-            offset += pol_id_len
-
-            # The PolyID in a VMAD can be relative, this offsets it.
-            pol_id += abs_pid
-            col = struct.unpack(">fff", col_bytes[offset : offset + 12])
-            offset += 12
-            if pol_id in colors:
-                colors[pol_id][pnt_id] = (col[0], col[1], col[2])
-            else:
-                colors[pol_id] = dict({pnt_id: (col[0], col[1], col[2])})
-    elif dia == 4:
-        while offset < chunk_len:
-            pnt_id, pnt_id_len = read_vx(col_bytes[offset : offset + 4])
-            offset += pnt_id_len
-            pol_id, pol_id_len = read_vx(col_bytes[offset : offset + 4])
-            offset += pol_id_len
-
-            pol_id += abs_pid
-            col = struct.unpack(">ffff", col_bytes[offset : offset + 16])
-            offset += 16
-            if pol_id in colors:
-                colors[pol_id][pnt_id] = (col[0], col[1], col[2])
-            else:
-                colors[pol_id] = dict({pnt_id: (col[0], col[1], col[2])})
-
-    if name in object_layers[-1].colmaps:
-        if "FaceMap" in object_layers[-1].colmaps[name]:
-            object_layers[-1].colmaps[name]["FaceMap"].update(colors)
-        else:
-            object_layers[-1].colmaps[name]["FaceMap"] = colors
+    if dia not in (3, 4):
+        name, _ = read_lwostring(col_bytes, 2)
+        colors = _obj_vmad.empty(3)
     else:
-        object_layers[-1].colmaps[name] = dict(FaceMap=colors)
+        name, colors = read_vmad_array(col_bytes, dia, abs_pid, split_size)
+        # Only the RGB part is used.
+        colors.values = np.ascontiguousarray(colors.values[:, :3])
 
+    colmaps = object_layers[-1].colmaps.setdefault(name, {})
+    _merge_vmap(colmaps, "FaceMap", colors)
 
-def read_uvmap(uv_bytes, object_layers):
-    """Read the simple UV coord values."""
-    chunk_len = len(uv_bytes)
-    offset = 2
-    name, name_len = read_lwostring(uv_bytes[offset:])
-    offset += name_len
-    uv_coords = {}
 
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(uv_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        pos = struct.unpack(">ff", uv_bytes[offset : offset + 8])
-        offset += 8
-        uv_coords[pnt_id] = (pos[0], pos[1])
-
-    if name in object_layers[-1].uvmaps_vmap:
-        if "PointMap" in object_layers[-1].uvmaps_vmap[name]:
-            object_layers[-1].uvmaps_vmap[name]["PointMap"].update(uv_coords)
-        else:
-            object_layers[-1].uvmaps_vmap[name]["PointMap"] = uv_coords
-    else:
-        object_layers[-1].uvmaps_vmap[name] = dict(PointMap=uv_coords)
+def read_uvmap(uv_bytes, object_layers, split_size=0):
+    """Read the simple UV coord values."""
+    name, uv_coords = read_vmap_array(uv_bytes, 2, split_size)
+    uvmaps = object_layers[-1].uvmaps_vmap.setdefault(name, {})
+    _merge_vmap(uvmaps, "PointMap", uv_coords)
 
 
-def read_uv_vmad(uv_bytes, object_layers, last_pols_count):
+def read_uv_vmad(uv_bytes, object_layers, last_pols_count, split_size=0):
     """Read the Discontinuous (per-polygon) uv values."""
-    chunk_len = len(uv_bytes)
-    offset = 2
-    name, name_len = read_lwostring(uv_bytes[offset:])
-    offset += name_len
-    uv_coords = {}
     abs_pid = len(object_layers[-1].pols) - last_pols_count
+    name, uv_coords = read_vmad_array(uv_bytes, 2, abs_pid, split_size)
+    uvmaps = object_layers[-1].uvmaps_vmad.setdefault(name, {})
+    _merge_vmap(uvmaps, "FaceMap", uv_coords)
 
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(uv_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        pol_id, pol_id_len = read_vx(uv_bytes[offset : offset + 4])
-        offset += pol_id_len
-
-        pol_id += abs_pid
-        pos = struct.unpack(">ff", uv_bytes[offset : offset + 8])
-        offset += 8
-        if pol_id in uv_coords:
-            uv_coords[pol_id][pnt_id] = (pos[0], pos[1])
-        else:
-            uv_coords[pol_id] = dict({pnt_id: (pos[0], pos[1])})
 
-    if name in object_layers[-1].uvmaps_vmad:
-        if "FaceMap" in object_layers[-1].uvmaps_vmad[name]:
-            object_layers[-1].uvmaps_vmad[name]["FaceMap"].update(uv_coords)
-        else:
-            object_layers[-1].uvmaps_vmad[name]["FaceMap"] = uv_coords
-    else:
-        object_layers[-1].uvmaps_vmad[name] = dict(FaceMap=uv_coords)
-
-
-def read_weight_vmad(ew_bytes, object_layers):
+def read_weight_vmad(ew_bytes, object_layers, last_pols_count, split_size=0):
     """Read the VMAD Weight values."""
-    chunk_len = len(ew_bytes)
-    offset = 2
-    name, name_len = read_lwostring(ew_bytes[offset:])
+    name, offset = read_lwostring(ew_bytes, 2)
     if name != "Edge Weight":
         return  # We just want the Catmull-Clark edge weights
 
-    offset += name_len
     # Some info: LW stores a face's points in a clock-wize order (with the
     # normal pointing at you). This gives edges a 'direction' which is used
     # when it comes to storing CC edge weight values. The weight is given
     # to the point preceding the edge that the weight belongs to.
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(ew_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        pol_id, pol_id_len = read_vx(ew_bytes[offset : offset + 4])
-        offset += pol_id_len
-        (weight,) = struct.unpack(">f", ew_bytes[offset : offset + 4])
-        offset += 4
+    layer = object_layers[-1]
+    pols = layer.pols
+    (pnt_ids, pol_ids), weights = read_vx_records(ew_bytes, offset, 2, 1, split_size)
+    pol_ids += len(pols) - last_pols_count
 
-        face_pnts = object_layers[-1].pols[pol_id]
-        try:
-            # Find the point's location in the polygon's point list
-            first_idx = face_pnts.index(pnt_id)
-        except:
-            continue
+    # Find the point's location in the polygon's point list.
+    loops = pols.find_corners(pol_ids, pnt_ids)
+    found = loops >= 0
+    loops, pol_ids = loops[found], pol_ids[found]
 
-        # Then get the next point in the list, or wrap around to the first
-        if first_idx == len(face_pnts) - 1:
-            second_pnt = face_pnts[0]
-        else:
-            second_pnt = face_pnts[first_idx + 1]
+    # Then get the next point in the list, or wrap around to the first.
+    following = loops + 1
+    wrap = following == pols.offsets[pol_ids + 1]
+    following[wrap] = pols.offsets[pol_ids[wrap]]
 
-        object_layers[-1].edge_weights["{0} {1}".format(second_pnt, pnt_id)] = weight
+    first = pnt_ids[found].astype(np.int64)
+    second = pols.indices[following].astype(np.int64)
+    edges = (np.minimum(first, second) << 32) | np.maximum(first, second)
+    layer.edge_weights.update(_obj_edge_weights(edges, weights[found, 0]))
 
 
-def read_normal_vmad(norm_bytes, object_layers):
+def read_normal_vmad(norm_bytes, object_layers, last_pols_count, split_size=0):
     """Read the VMAD Split Vertex Normals"""
-    chunk_len = len(norm_bytes)
-    offset = 2
-    name, name_len = read_lwostring(norm_bytes[offset:])
-    lnorms = {}
-    offset += name_len
+    abs_pid = len(object_layers[-1].pols) - last_pols_count
+    _, lnorms = read_vmad_array(norm_bytes, 3, abs_pid, split_size)
+    # Swap Y and Z to match Blender's pitch.
+    lnorms.values = np.ascontiguousarray(lnorms.values[:, [0, 2, 1]])
+    object_layers[-1].lnorms.update(lnorms)
 
-    while offset < chunk_len:
-        pnt_id, pnt_id_len = read_vx(norm_bytes[offset : offset + 4])
-        offset += pnt_id_len
-        pol_id, pol_id_len = read_vx(norm_bytes[offset : offset + 4])
-        offset += pol_id_len
-        norm = struct.unpack(">fff", norm_bytes[offset : offset + 12])
-        offset += 12
-        if not (pol_id in lnorms.keys()):
-            lnorms[pol_id] = []
-        lnorms[pol_id].append([pnt_id, norm[0], norm[2], norm[1]])
 
-    print(f"LENGTH {len(lnorms.keys())}")
-    object_layers[-1].lnorms = lnorms
+def _extend_pols(layer, indices, offsets):
+    """Add polygons to the layer, with no surface assigned yet."""
+    layer.pols.extend(indices, offsets)
+    unassigned = np.full(len(offsets) - 1, -1, dtype=np.int32)
+    layer.surf_ids = np.concatenate((layer.surf_ids, unassigned))
 
 
-def read_pols(pol_bytes, object_layers):
+def _assign_surfs(layer, pol_ids, sids):
+    """Set the surface index of the given polygons, later entries win."""
+    for sid in sids[np.sort(np.unique(sids, return_index=True)[1])].tolist():
+        if sid not in layer.surf_keys:
+            layer.surf_keys.append(sid)
+
+    pol_ids, sids = _keep_last(pol_ids, sids)
+    valid = (pol_ids >= 0) & (pol_ids < len(layer.surf_ids))
+    layer.surf_ids[pol_ids[valid]] = sids[valid]
+
+
+def read_pols(pol_bytes, object_layers, split_size=0):
     """Read the layer's polygons, each one is just a list of point indexes."""
     print(f"\tReading Layer ({object_layers[-1].name}) Polygons")
-    offset = 0
-    pols_count = len(pol_bytes)
-    old_pols_count = len(object_layers[-1].pols)
+    values = read_vx_array(pol_bytes, split_size)
+    heads, indices, offsets = read_pols_array(values, split_size=split_size)
+    _extend_pols(object_layers[-1], indices, offsets)
 
-    while offset < pols_count:
-        (pnts_count,) = struct.unpack(">H", pol_bytes[offset : offset + 2])
-        offset += 2
-        all_face_pnts = []
-        for j in range(pnts_count):
-            face_pnt, data_size = read_vx(pol_bytes[offset : offset + 4])
-            offset += data_size
-            all_face_pnts.append(face_pnt)
-        all_face_pnts.reverse()  # correct normals
+    return len(heads)
 
-        object_layers[-1].pols.append(all_face_pnts)
 
-    return len(object_layers[-1].pols) - old_pols_count
+def read_pols_5_array(pol_bytes, split_size=0):
+    """Read LWOB polygons into CSR arrays, with each polygon's surface
+    index, -1 for none."""
+    # LWOB indexes are always two bytes, so no variable-length decoding.
+    words = np.frombuffer(pol_bytes, dtype=">u2", count=len(pol_bytes) // 2)
+    heads, indices, offsets = read_pols_array(
+        words.astype(np.int32), extra=1, split_size=split_size
+    )
+    sids = words[heads + np.diff(offsets) + 1].astype(np.uint16).view(np.int16)
+    sids = np.abs(sids.astype(np.int32)) - 1
+    return heads, indices, offsets, sids
 
 
-def read_pols_5(pol_bytes, object_layers):
+def read_pols_5(pol_bytes, object_layers, split_size=0):
     """
     Read the polygons, each one is just a list of point indexes.
     But it also includes the surface index.
     """
     print(f"\tReading Layer ({object_layers[-1].name}) Polygons")
-    offset = 0
-    chunk_len = len(pol_bytes)
-    old_pols_count = len(object_layers[-1].pols)
-    poly = 0
+    heads, indices, offsets, sids = read_pols_5_array(pol_bytes, split_size)
+    first = len(object_layers[-1].pols)
+    _extend_pols(object_layers[-1], indices, offsets)
 
-    while offset < chunk_len:
-        (pnts_count,) = struct.unpack(">H", pol_bytes[offset : offset + 2])
-        offset += 2
-        all_face_pnts = []
-        for j in range(pnts_count):
-            (face_pnt,) = struct.unpack(">H", pol_bytes[offset : offset + 2])
-            offset += 2
-            all_face_pnts.append(face_pnt)
-        all_face_pnts.reverse()
+    pol_ids = np.arange(first, first + len(sids))
+    valid = sids >= 0  # Surface 0 doesn't exist.
+    _assign_surfs(object_layers[-1], pol_ids[valid], sids[valid])
 
-        object_layers[-1].pols.append(all_face_pnts)
-        (sid,) = struct.unpack(">h", pol_bytes[offset : offset + 2])
-        offset += 2
-        sid = abs(sid) - 1
-        if sid not in object_layers[-1].surf_tags:
-            object_layers[-1].surf_tags[sid] = []
-        object_layers[-1].surf_tags[sid].append(poly)
-        poly += 1
-
-    return len(object_layers[-1].pols) - old_pols_count
+    return len(heads)
 
 
 def read_bones(bone_bytes, lwo):
@@ -692,8 +1279,6 @@ def read_bone_tags(tag_bytes, lwo, type):
 def read_surf_tags(tag_bytes, object_layers, last_pols_count):
     """Read the list of PolyIDs and tag indexes."""
     print(f"\tReading Layer ({object_layers[-1].name}) Surface Assignments")
-    offset = 0
-    chunk_len = len(tag_bytes)
 
     # Read in the PolyID/Surface Index pairs.
     abs_pid = len(object_layers[-1].pols) - last_pols_count
@@ -703,27 +1288,21 @@ def read_surf_tags(tag_bytes, object_layers, last_pols_count):
         raise Exception(
             len(object_layers[-1].pols), last_pols_count, object_layers[-1].pols
         )
-    while offset < chunk_len:
-        pid, pid_len = read_vx(tag_bytes[offset : offset + 4])
-        offset += pid_len
-        (sid,) = struct.unpack(">H", tag_bytes[offset : offset + 2])
-        offset += 2
-        if sid not in object_layers[-1].surf_tags:
-            object_layers[-1].surf_tags[sid] = []
-        object_layers[-1].surf_tags[sid].append(pid + abs_pid)
+    pol_ids, sids = read_ptag_array(tag_bytes)
+    _assign_surfs(object_layers[-1], pol_ids + abs_pid, sids)
 
 
 def read_clip(clip_bytes, lwo):
     """Read texture clip path"""
     c_id = struct.unpack(">L", clip_bytes[0:4])[0]
-    orig_path, path_len = read_lwostring(clip_bytes[10:])
+    orig_path, _ = read_lwostring(clip_bytes, 10)
     lwo.clips[c_id] = orig_path
 
 
 def read_texture(surf_bytes, offset, subchunk_len, debug=False):
     texture = _surf_texture()
-    ordinal, ord_len = read_lwostring(surf_bytes[offset + 4 :])
-    suboffset = 6 + ord_len
+    ordinal, ord_end = read_lwostring(surf_bytes, offset + 4)
+    suboffset = 6 + ord_end - (offset + 4)
     while suboffset < subchunk_len:
         (subsubchunk_name,) = struct.unpack(
             "4s", surf_bytes[offset + suboffset : offset + suboffset + 4]
@@ -765,10 +1344,10 @@ def read_texture(surf_bytes, offset, subchunk_len, debug=False):
                 surf_bytes[offset + suboffset : offset + suboffset + 2],
             )
         elif subsubchunk_name == b"VMAP":
-            texture.uvname, name_len = read_lwostring(surf_bytes[offset + suboffset :])
-            # print(f"VMAP {texture.uvname} {name_len}")
+            texture.uvname, _ = read_lwostring(surf_bytes, offset + suboffset)
+            # print(f"VMAP {texture.uvname}")
         elif subsubchunk_name == b"FUNC":  # This is the procedural
-            texture.func, name_len = read_lwostring(surf_bytes[offset + suboffset :])
+            texture.func, _ = read_lwostring(surf_bytes, offset + suboffset)
         elif subsubchunk_name == b"NEGA":
             (texture.nega,) = struct.unpack(
                 ">H",
@@ -854,13 +1433,12 @@ def read_surf(surf_bytes, lwo):
         print("Reading Object Surfaces")
 
     surf = _obj_surf()
-    name, name_len = read_lwostring(surf_bytes)
+    name, offset = read_lwostring(surf_bytes)
     if len(name) != 0:
         surf.name = name
 
     # We have to read this, but we won't use it...yet.
-    s_name, s_name_len = read_lwostring(surf_bytes[name_len:])
-    offset = name_len + s_name_len
+    s_name, offset = read_lwostring(surf_bytes, offset)
     block_size = len(surf_bytes)
     while offset < block_size:
         (subchunk_name,) = struct.unpack("4s", surf_bytes[offset : offset + 4])
@@ -980,11 +1558,10 @@ def read_surf_5(surf_bytes, lwo, dirpath=None):
         print("Reading Object Surfaces 5")
 
     surf = _obj_surf()
-    name, name_len = read_lwostring(surf_bytes)
+    name, offset = read_lwostring(surf_bytes)
     if len(name) != 0:
         surf.name = name
 
-    offset = name_len
     chunk_len = len(surf_bytes)
     while offset < chunk_len:
         (subchunk_name,) = struct.unpack("4s", surf_bytes[offset : offset + 4])
@@ -1040,7 +1617,7 @@ def read_surf_5(surf_bytes, lwo, dirpath=None):
             texture = None
 
         elif subchunk_name == b"TIMG":
-            path, path_len = read_lwostring(surf_bytes[offset:])
+            path, _ = read_lwostring(surf_bytes, offset)
             if path == "(none)":
                 continue
 
@@ -1081,6 +1658,17 @@ def read_surf_5(surf_bytes, lwo, dirpath=None):
     lwo.surfs[surf.name] = surf
 
 
+# The LWOB chunks that are read into the current layer.
+LWOB_LAYER_CHUNKS = (b"POLS", b"PCHS", b"PTAG")
+
+
+def open_lwo(filename, use_mmap=True):
+    """Open a file to read chunks from, memory mapped unless it is empty."""
+    if use_mmap and os.path.getsize(filename) > 0:
+        return MappedFile(filename)
+    return open(filename, "rb")
+
+
 class lwoObject:
     def __init__(self, filename):
         self.name, self.ext = os.path.splitext(os.path.basename(filename))
@@ -1092,9 +1680,15 @@ class lwoObject:
         self.tags = []
         self.clips = {}
         self.images = []
+        # The objects built so far, by layer index, with their parent's index.
+        self.objects = {}
+        # Streamed meshes waiting for the surfaces to be read.
+        self.unassigned = []
 
         self.allow_images_missing = False
         self.absfilepath = True
+        # Read the chunks straight from a memory map of the file.
+        self.use_mmap = True
         self.cwd = os.getcwd()
 
         # self.read()
@@ -1118,14 +1712,72 @@ class lwoObject:
 
     def read(self, ch):
         self.ch = ch
-
-        self.f = open(self.filename, "rb")
+        data = self.session_data(ch)
+        if data is None:
+            data = self.parse(ch)
+            if data is None:
+                return
+            self.keep_session_data(ch, data)
+        self.set_parsed(data)
+
+    def session_data(self, ch):
+        """The data parsed from this file earlier in the session, or None."""
+        if not ch.use_session_cache:
+            return None
+        data = session_cache.load(session_cache.key(self.filename, ch.parse_options()))
+        if data is not None:
+            print(f"Reusing LWO parsed earlier: {self.filename}")
+        return data
+
+    def keep_session_data(self, ch, data):
+        if ch.use_session_cache:
+            key = session_cache.key(self.filename, ch.parse_options())
+            session_cache.store(key, data)
+
+    def parse(self, ch):
+        """Parse the file, or load it from the disk cache.
+
+        Returns the layers, surfaces, tags and clips, or None if there are
+        no layers.
+        """
+        self.ch = ch
+        cache = None
+        if ch.use_cache:
+            cache = lwoCache(ch.cache_dir, ch.cache_size)
+            key = cache.key(self.filename, ch.parse_options())
+            data = cache.load(key)
+            if data is not None:
+                print(f"Loading LWO from cache: {self.filename}")
+                return data
+
+        self.read_file()
+        if not self.layers:
+            return None
+        data = (self.layers, self.surfs, self.tags, self.clips)
+        if cache is not None:
+            cache.store(key, data)
+        return data
+
+    def set_parsed(self, data):
+        """Take copies of the parsed layers, surfaces, tags and clips.
+
+        The arrays are shared, the import never changes them in place, but
+        the layers and surfaces are changed while the objects are built.
+        """
+        layers, surfs, tags, clips = data
+        self.layers = [copy.copy(layer) for layer in layers]
+        self.surfs = copy.deepcopy(surfs)
+        self.tags = list(tags)
+        self.clips = dict(clips)
+
+    def read_file(self):
+        # Reading ahead is for files that are slow to read, not mapped ones.
+        self.f = open_lwo(self.filename, self.use_mmap and not self.ch.read_ahead)
         try:
-            header, chunk_size, chunk_name = struct.unpack(">4s1L4s", self.f.read(12))
-        except:
-            print(f"Error parsing file header! Filename {self.filename}")
+            chunk_name = self.read_header()
+        except lwoUnsupportedFileException:
             self.f.close()
-            return
+            raise
 
         if chunk_name == b"LWO2":
             self.read_lwo2()
@@ -1139,6 +1791,50 @@ class lwoObject:
         self.f.close()
         del self.f
 
+    def read_header(self):
+        """Read the FORM header, returning the file type."""
+        try:
+            header, chunk_size, chunk_name = struct.unpack(">4s1L4s", self.f.read(12))
+        except struct.error:
+            msg = "Error parsing file header! Filename {}".format(self.filename)
+            raise lwoUnsupportedFileException(msg) from None
+        return chunk_name
+
+    def iter_layers(self, ch):
+        """Read the file, yielding each layer as soon as it is complete.
+
+        A layer is only kept until the next one starts, so one layer is in
+        memory at a time.  The surfaces, tags and clips are read as usual,
+        and are all there once the last layer has been yielded.  The caches
+        and layer threads aren't used.
+        """
+        self.ch = ch
+        self.f = open_lwo(self.filename, self.use_mmap and not ch.read_ahead)
+        try:
+            chunk_name = self.read_header()
+            if chunk_name == b"LWO2":
+                print(f"Importing LWO: {self.filename}\nLWO v2 Format")
+                read_chunk = self.read_lwo2_chunk
+            elif chunk_name == b"LWOB" or chunk_name == b"LWLO":
+                print(f"Importing LWO: {self.filename}\nLWO v1 Format")
+                read_chunk = self.read_lwob_chunk
+            else:
+                msg = "Invalid LWO File Type: {}".format(self.filename)
+                raise lwoUnsupportedFileException(msg)
+
+            self.handle_layer = True
+            self.last_pols_count = 0
+            self.just_read_bones = False
+            for rootchunk in self.root_chunks():
+                read_chunk(rootchunk)
+                while len(self.layers) > 1:
+                    yield self.layers.pop(0)
+            while self.layers:
+                yield self.layers.pop(0)
+        finally:
+            self.f.close()
+            del self.f
+
     def pprint(self):
 
         layers = []
@@ -1168,28 +1864,34 @@ class lwoObject:
         return paths
 
     def resolve_clips(self):
-        files = []
-        for search_path in self.search_paths:
-            files.extend(glob("{0}/*.*".format(search_path)))
-            if self.ch.recursive:
-                files.extend(glob("{0}/**/*.*".format(search_path)))
-
+        names = {}
         for c_id in self.clips:
             clip = self.clips[c_id]
             # LW is windows tools, so windows path need to be replaced
             # under linux, and treated the sameunder windows
-            imagefile = os.path.basename(clip.replace("\\", os.sep))
-            ifile = None
-            for f in files:
-                if re.search(re.escape(imagefile), f, re.I):
-                    if self.absfilepath:
-                        ifile = os.path.abspath(f)
-                    else:
-                        ifile = os.path.relpath(f)
-
-                    if ifile not in self.images:
-                        self.images.append(ifile)
-                    continue
+            names[c_id] = os.path.basename(clip.replace("\\", os.sep))
+
+        cache = image_cache if self.ch.cache_images else lwoImageCache()
+        found = cache.resolve(
+            self.filename,
+            set(names.values()),
+            self.search_paths,
+            self.ch.recursive,
+            self.ch.search_depth,
+            self.ch.search_ignore,
+            self.ch.image_extensions,
+            self.ch.search_threads,
+        )
+        for c_id, imagefile in names.items():
+            ifile = found[imagefile]
+            if ifile is not None:
+                if self.absfilepath:
+                    ifile = os.path.abspath(ifile)
+                else:
+                    ifile = os.path.relpath(ifile)
+
+                if ifile not in self.images:
+                    self.images.append(ifile)
             self.ch.images[c_id] = ifile
 
         for c_id in self.clips:
@@ -1221,155 +1923,236 @@ class lwoObject:
         self.last_pols_count = 0
         self.just_read_bones = False
         print(f"Importing LWO: {self.filename}\nLWO v2 Format")
+        if self.ch.layer_threads != 1 and not self.ch.read_ahead:
+            if self.read_lwo2_layers():
+                return
+
+        for rootchunk in self.root_chunks():
+            self.read_lwo2_chunk(rootchunk)
+
+    def root_chunks(self):
+        """The root chunks left in the file, read ahead on another thread
+        when ch.read_ahead is set."""
+        if not self.ch.read_ahead:
+            while True:
+                try:
+                    rootchunk = Chunk(self.f)
+                except EOFError:
+                    return
+                yield rootchunk
+
+        with ChunkReader(self.f, self.ch.read_ahead, self.ch.queue_depth) as reader:
+            for chunk in reader:
+                try:
+                    rootchunk = Chunk(BufferFile(chunk))
+                except EOFError:
+                    return
+                yield rootchunk
+
+    def read_lwo2_layers(self):
+        """Read the layers of a version 2 file in a thread pool.
+
+        The chunks are indexed first.  Groups of layers are then read side
+        by side while the other chunks are read here, and the layers are put
+        back in file order.  Returns False, having read nothing, when there
+        is nothing to gain or the file has to be read in order.
+        """
+        from .lwoIndex import lwoIndex
+
+        index = lwoIndex(self.filename)
+        index.use_mmap = self.use_mmap
+        index.read()
+        groups = index.layer_groups(self.ch)
+        if groups is None or len(groups) < 2:
+            return False
+        workers = min(self.ch.layer_threads or os.cpu_count() or 1, len(groups))
+        if workers < 2:
+            return False
 
-        while True:
-            try:
-                rootchunk = Chunk(self.f)
-            except EOFError:
-                break
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(index.read_layers, g, None, self.ch) for g in groups]
+            for entry in index.chunks:
+                if entry.layer < 0:
+                    self.f.seek(entry.offset - 8)
+                    self.read_lwo2_chunk(Chunk(self.f))
+            for future in futures:
+                self.layers.extend(future.result())
+        return True
 
-            if rootchunk.chunkname == b"TAGS":
-                read_tags(rootchunk.read(), self)
-            elif rootchunk.chunkname == b"LAYR":
-                self.handle_layer = read_layr(
-                    rootchunk.read(), self.layers, self.ch.load_hidden
-                )
-            elif rootchunk.chunkname == b"PNTS" and self.handle_layer:
-                read_pnts(rootchunk.read(), self.layers)
-            elif rootchunk.chunkname == b"VMAP" and self.handle_layer:
-                vmap_type = rootchunk.read(4)
-
-                if vmap_type == b"WGHT":
-                    read_weightmap(rootchunk.read(), self.layers)
-                elif vmap_type == b"MORF":
-                    read_morph(rootchunk.read(), self.layers, False)
-                elif vmap_type == b"SPOT":
-                    read_morph(rootchunk.read(), self.layers, True)
-                elif vmap_type == b"TXUV":
-                    read_uvmap(rootchunk.read(), self.layers)
-                elif vmap_type == b"RGB " or vmap_type == b"RGBA":
-                    read_colmap(rootchunk.read(), self.layers)
-                elif vmap_type == b"NORM":
-                    read_normmap(rootchunk.read(), self.layers)
-                elif vmap_type == b"PICK":
-                    rootchunk.skip()  # SKIPPING
-                else:
-                    print(f"Skipping vmap_type: {vmap_type}")
-                    rootchunk.skip()
+    def read_lwo2_chunk(self, rootchunk):
+        """Read one root chunk of a version 2 file."""
+        split = self.ch.split_chunk_size
+        if rootchunk.chunkname == b"TAGS":
+            read_tags(rootchunk.read(), self)
+        elif rootchunk.chunkname == b"LAYR":
+            self.handle_layer = read_layr(
+                rootchunk.read(), self.layers, self.ch.load_hidden
+            )
+            if self.handle_layer and not self.ch.use_layer(self.layers[-1]):
+                self.layers.pop()
+                self.handle_layer = False
+        elif rootchunk.chunkname == b"PNTS" and self.handle_layer:
+            read_pnts(rootchunk.read(), self.layers)
+        elif rootchunk.chunkname == b"VMAP" and self.handle_layer:
+            vmap_type = bytes(rootchunk.read(4))
+
+            if not self.ch.use_map(rootchunk.chunkname, vmap_type):
+                rootchunk.skip()
+            elif vmap_type == b"WGHT":
+                read_weightmap(rootchunk.read(), self.layers, split)
+            elif vmap_type == b"MORF":
+                read_morph(rootchunk.read(), self.layers, False, split)
+            elif vmap_type == b"SPOT":
+                read_morph(rootchunk.read(), self.layers, True, split)
+            elif vmap_type == b"TXUV":
+                read_uvmap(rootchunk.read(), self.layers, split)
+            elif vmap_type == b"RGB " or vmap_type == b"RGBA":
+                read_colmap(rootchunk.read(), self.layers, split)
+            elif vmap_type == b"NORM":
+                read_normmap(rootchunk.read(), self.layers, split)
+            elif vmap_type == b"PICK":
+                rootchunk.skip()  # SKIPPING
+            else:
+                print(f"Skipping vmap_type: {vmap_type}")
+                rootchunk.skip()
 
-            elif rootchunk.chunkname == b"VMAD" and self.handle_layer:
-                vmad_type = rootchunk.read(4)
-
-                if vmad_type == b"TXUV":
-                    read_uv_vmad(rootchunk.read(), self.layers, self.last_pols_count)
-                elif vmad_type == b"RGB " or vmad_type == b"RGBA":
-                    read_color_vmad(rootchunk.read(), self.layers, self.last_pols_count)
-                elif vmad_type == b"WGHT":
-                    # We only read the Edge Weight map if it's there.
-                    read_weight_vmad(rootchunk.read(), self.layers)
-                elif vmad_type == b"NORM":
-                    read_normal_vmad(rootchunk.read(), self.layers)
-                else:
-                    print(f"Skipping vmad_type: {vmad_type}")
-                    rootchunk.skip()
+        elif rootchunk.chunkname == b"VMAD" and self.handle_layer:
+            vmad_type = bytes(rootchunk.read(4))
+
+            if not self.ch.use_map(rootchunk.chunkname, vmad_type):
+                rootchunk.skip()
+            elif vmad_type == b"TXUV":
+                read_uv_vmad(
+                    rootchunk.read(), self.layers, self.last_pols_count, split
+                )
+            elif vmad_type == b"RGB " or vmad_type == b"RGBA":
+                read_color_vmad(
+                    rootchunk.read(), self.layers, self.last_pols_count, split
+                )
+            elif vmad_type == b"WGHT":
+                # We only read the Edge Weight map if it's there.
+                read_weight_vmad(
+                    rootchunk.read(), self.layers, self.last_pols_count, split
+                )
+            elif vmad_type == b"NORM":
+                read_normal_vmad(
+                    rootchunk.read(), self.layers, self.last_pols_count, split
+                )
+            else:
+                print(f"Skipping vmad_type: {vmad_type}")
+                rootchunk.skip()
 
-            elif rootchunk.chunkname == b"POLS" and self.handle_layer:
-                face_type = rootchunk.read(4)
-                self.just_read_bones = False
-                # PTCH is LW's Subpatches, SUBD is CatmullClark.
-                if (
-                    face_type == b"FACE" or face_type == b"PTCH" or face_type == b"SUBD"
-                ) and self.handle_layer:
-                    self.last_pols_count = read_pols(rootchunk.read(), self.layers)
-                    if face_type != b"FACE":
-                        self.layers[-1].has_subds = True
-                elif face_type == b"BONE" and self.handle_layer:
+        elif rootchunk.chunkname == b"POLS" and self.handle_layer:
+            face_type = bytes(rootchunk.read(4))
+            self.just_read_bones = False
+            # PTCH is LW's Subpatches, SUBD is CatmullClark.
+            if (
+                face_type == b"FACE" or face_type == b"PTCH" or face_type == b"SUBD"
+            ) and self.handle_layer:
+                self.last_pols_count = read_pols(rootchunk.read(), self.layers, split)
+                if face_type != b"FACE":
+                    self.layers[-1].has_subds = True
+            elif face_type == b"BONE" and self.handle_layer:
+                if self.ch.skel_to_arm:
                     read_bones(rootchunk.read(), self)
-                    self.just_read_bones = True
                 else:
-                    print(f"Skipping face_type: {face_type}")
                     rootchunk.skip()
+                self.just_read_bones = True
+            else:
+                print(f"Skipping face_type: {face_type}")
+                rootchunk.skip()
 
-            elif rootchunk.chunkname == b"PTAG" and self.handle_layer:
-                (tag_type,) = struct.unpack("4s", rootchunk.read(4))
-                if tag_type == b"SURF" and not self.just_read_bones:
-                    # Ignore the surface data if we just read a bones chunk.
-                    read_surf_tags(rootchunk.read(), self.layers, self.last_pols_count)
-
-                elif self.ch.skel_to_arm:
-                    if tag_type == b"BNUP":
-                        read_bone_tags(rootchunk.read(), self, "BNUP")
-                    elif tag_type == b"BONE":
-                        read_bone_tags(rootchunk.read(), self, "BONE")
-                    elif tag_type == b"PART":
-                        rootchunk.skip()  # SKIPPING
-                    elif tag_type == b"COLR":
-                        rootchunk.skip()  # SKIPPING
-                    else:
-                        print(f"Skipping tag: {tag_type}")
-                        rootchunk.skip()
+        elif rootchunk.chunkname == b"PTAG" and self.handle_layer:
+            (tag_type,) = struct.unpack("4s", rootchunk.read(4))
+            if tag_type == b"SURF" and not self.just_read_bones:
+                # Ignore the surface data if we just read a bones chunk.
+                read_surf_tags(rootchunk.read(), self.layers, self.last_pols_count)
+
+            elif self.ch.skel_to_arm:
+                if tag_type == b"BNUP":
+                    read_bone_tags(rootchunk.read(), self, "BNUP")
+                elif tag_type == b"BONE":
+                    read_bone_tags(rootchunk.read(), self, "BONE")
+                elif tag_type == b"PART":
+                    rootchunk.skip()  # SKIPPING
+                elif tag_type == b"COLR":
+                    rootchunk.skip()  # SKIPPING
                 else:
-                    print(f"Skipping tag_type: {tag_type}")
+                    print(f"Skipping tag: {tag_type}")
                     rootchunk.skip()
-            elif rootchunk.chunkname == b"SURF":
-                read_surf(rootchunk.read(), self)
-            elif rootchunk.chunkname == b"CLIP":
-                read_clip(rootchunk.read(), self)
-            elif rootchunk.chunkname == b"BBOX":
-                rootchunk.skip()  # SKIPPING
-            elif rootchunk.chunkname == b"VMPA":
-                rootchunk.skip()  # SKIPPING
-            elif rootchunk.chunkname == b"PNTS":
-                rootchunk.skip()  # SKIPPING
-            elif rootchunk.chunkname == b"POLS":
-                rootchunk.skip()  # SKIPPING
-            elif rootchunk.chunkname == b"PTAG":
-                rootchunk.skip()  # SKIPPING
             else:
-                # if self.handle_layer:
-                print(f"Skipping Chunk: {rootchunk.chunkname}")
+                print(f"Skipping tag_type: {tag_type}")
                 rootchunk.skip()
+        elif rootchunk.chunkname == b"SURF":
+            read_surf(rootchunk.read(), self)
+        elif rootchunk.chunkname == b"CLIP":
+            read_clip(rootchunk.read(), self)
+        elif rootchunk.chunkname == b"BBOX":
+            rootchunk.skip()  # SKIPPING
+        elif rootchunk.chunkname == b"VMPA":
+            rootchunk.skip()  # SKIPPING
+        elif rootchunk.chunkname == b"PNTS":
+            rootchunk.skip()  # SKIPPING
+        elif rootchunk.chunkname == b"POLS":
+            rootchunk.skip()  # SKIPPING
+        elif rootchunk.chunkname == b"PTAG":
+            rootchunk.skip()  # SKIPPING
+        else:
+            # if self.handle_layer:
+            print(f"Skipping Chunk: {rootchunk.chunkname}")
+            rootchunk.skip()
 
     def read_lwob(self):
         """Read version 1 file, LW < 6."""
+        self.handle_layer = True
         self.last_pols_count = 0
         print(f"Importing LWO: {self.filename}\nLWO v1 Format")
 
-        while True:
-            try:
-                rootchunk = Chunk(self.f)
-            except EOFError:
-                break
-
-            if rootchunk.chunkname == b"SRFS":
-                read_tags(rootchunk.read(), self)
-            elif rootchunk.chunkname == b"LAYR":
-                read_layr_5(rootchunk.read(), self.layers)
-            elif rootchunk.chunkname == b"PNTS":
-                if len(self.layers) == 0:
-                    # LWOB files have no LAYR chunk to set this up.
-                    nlayer = _obj_layer()
-                    nlayer.name = "Layer 1"
+        for rootchunk in self.root_chunks():
+            self.read_lwob_chunk(rootchunk)
+
+    def read_lwob_chunk(self, rootchunk):
+        """Read one root chunk of a version 1 file."""
+        split = self.ch.split_chunk_size
+        if rootchunk.chunkname == b"SRFS":
+            read_tags(rootchunk.read(), self)
+        elif rootchunk.chunkname == b"LAYR":
+            read_layr_5(rootchunk.read(), self.layers)
+            self.handle_layer = self.ch.use_layer(self.layers[-1])
+            if not self.handle_layer:
+                self.layers.pop()
+        elif rootchunk.chunkname == b"PNTS":
+            if len(self.layers) == 0 and self.handle_layer:
+                # LWOB files have no LAYR chunk to set this up.
+                nlayer = _obj_layer()
+                nlayer.name = "Layer 1"
+                self.handle_layer = self.ch.use_layer(nlayer)
+                if self.handle_layer:
                     self.layers.append(nlayer)
+            if self.handle_layer:
                 read_pnts(rootchunk.read(), self.layers)
-            elif rootchunk.chunkname == b"POLS":
-                self.last_pols_count = read_pols_5(rootchunk.read(), self.layers)
-            elif rootchunk.chunkname == b"PCHS":
-                self.last_pols_count = read_pols_5(rootchunk.read(), self.layers)
-                self.layers[-1].has_subds = True
-            elif rootchunk.chunkname == b"PTAG":
-                (tag_type,) = struct.unpack("4s", rootchunk.read(4))
-                if tag_type == b"SURF":
-                    raise Exception("Missing commented out function")
-                #                     read_surf_tags_5(
-                #                         rootchunk.read(), self.layers, self.last_pols_count
-                #                     )
-                else:
-                    rootchunk.skip()
-            elif rootchunk.chunkname == b"SURF":
-                read_surf_5(rootchunk.read(), self)
             else:
-                # For Debugging \/.
-                # if handle_layer:
-                print(f"Skipping Chunk: {rootchunk.chunkname}")
                 rootchunk.skip()
+        elif not self.handle_layer and rootchunk.chunkname in LWOB_LAYER_CHUNKS:
+            rootchunk.skip()  # Not a chosen layer
+        elif rootchunk.chunkname == b"POLS":
+            self.last_pols_count = read_pols_5(rootchunk.read(), self.layers, split)
+        elif rootchunk.chunkname == b"PCHS":
+            self.last_pols_count = read_pols_5(rootchunk.read(), self.layers, split)
+            self.layers[-1].has_subds = True
+        elif rootchunk.chunkname == b"PTAG":
+            (tag_type,) = struct.unpack("4s", rootchunk.read(4))
+            if tag_type == b"SURF":
+                raise Exception("Missing commented out function")
+            #                     read_surf_tags_5(
+            #                         rootchunk.read(), self.layers, self.last_pols_count
+            #                     )
+            else:
+                rootchunk.skip()
+        elif rootchunk.chunkname == b"SURF":
+            read_surf_5(rootchunk.read(), self)
+        else:
+            # For Debugging \/.
+            # if handle_layer:
+            print(f"Skipping Chunk: {rootchunk.chunkname}")
+            rootchunk.skip()
@@ -0,0 +1,327 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import struct
+from types import SimpleNamespace
+import numpy as np
+from .chunk import Chunk
+from .lwoObject import (
+    DEFAULT_SPLIT_CHUNK_SIZE,
+    lwoUnsupportedFileException,
+    _lwo_base,
+    _obj_layer,
+    open_lwo,
+    read_clip,
+    read_layr,
+    read_layr_5,
+    read_lwostring,
+    read_pnts_array,
+    read_pols_5_array,
+    read_pols_array,
+    read_ptag_array,
+    read_surf,
+    read_surf_5,
+    read_tags,
+    read_vx_array,
+    read_vx_records,
+)
+
+
+class _lwo_record(_lwo_base):
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for k, value in zip(self.__slots__, values):
+            setattr(self, k, value)
+
+
+class lwoTags(_lwo_record):
+    """The tag strings, the surface and bone names that PTAGs point at."""
+
+    __slots__ = ("tags",)
+
+
+class lwoLayer(_lwo_record):
+    """The start of a layer, the records up to the next one belong to it.
+
+    layer counts the layers streamed so far, from 0, and is repeated in
+    the records of the layer.  The pivot has Y and Z swapped.
+    """
+
+    __slots__ = (
+        "layer",
+        "index",
+        "name",
+        "pivot",
+        "parent_index",
+        "hidden",
+    )
+
+
+class lwoPoints(_lwo_record):
+    """A block of points, numbered on from first in the layer.
+
+    pnts is (N, 3) float32, relative to the pivot with Y and Z swapped, as
+    lwoObject reads them.
+    """
+
+    __slots__ = ("layer", "first", "pnts")
+
+
+class lwoPolygons(_lwo_record):
+    """A block of polygons, numbered on from first in the layer.
+
+    kind is FACE, PTCH, SUBD or BONE.  The point indexes are in CSR form,
+    polygon i being indices[offsets[i]:offsets[i + 1]], in reverse file
+    order as lwoObject has them.  Bones are numbered apart from the other
+    polygons.
+    """
+
+    __slots__ = ("layer", "kind", "first", "indices", "offsets")
+
+
+class lwoVMap(_lwo_record):
+    """A per-point map, values[i], with dim floats, belongs to pnt_ids[i].
+
+    The values are as stored in the file, repeated points included.
+    """
+
+    __slots__ = ("layer", "kind", "name", "dim", "pnt_ids", "values")
+
+
+class lwoVMad(_lwo_record):
+    """A per-polygon map, with the polygons numbered as in lwoPolygons."""
+
+    __slots__ = ("layer", "kind", "name", "dim", "pnt_ids", "pol_ids", "values")
+
+
+class lwoPTag(_lwo_record):
+    """Tags for polygons, tags[i] belongs to polygon pol_ids[i].
+
+    kind is SURF, PART, SMGP, BONE, BNUP and so on.  BONE and BNUP tags
+    number the bones, the others number polygons as lwoPolygons does.
+    LWOB surface indexes come as SURF tags too.
+    """
+
+    __slots__ = ("layer", "kind", "pol_ids", "tags")
+
+
+class lwoSurface(_lwo_record):
+    """A surface, as lwoObject reads it into lwoObject.surfs."""
+
+    __slots__ = ("surf",)
+
+
+class lwoClip(_lwo_record):
+    """An image, id is what the surface textures refer to it by."""
+
+    __slots__ = ("id", "path")
+
+
+class _record_reader:
+    """Turn root chunks into records, keeping track of the current layer."""
+
+    def __init__(self, form, ch=None):
+        self.form = form
+        self.ch = ch
+        self.split = DEFAULT_SPLIT_CHUNK_SIZE if ch is None else ch.split_chunk_size
+        self.layer = -1
+        self.handle_layer = True
+        self.pivot = [0, 0, 0]
+        self.pnts_count = 0
+        self.pols_count = 0
+        self.bones_count = 0
+        # Polygons in the last POLS chunk, PTAG and VMAD chunks count from
+        # its first polygon, as they do in lwoObject.
+        self.last_pols_count = 0
+
+    def use_map(self, chunkname, map_type):
+        return self.ch is None or self.ch.use_map(chunkname, map_type)
+
+    def start_layer(self, layer, hidden):
+        if self.ch is not None:
+            if hidden and not self.ch.load_hidden:
+                self.handle_layer = False
+            else:
+                self.handle_layer = self.ch.use_layer(layer)
+        if not self.handle_layer:
+            return None
+        self.layer += 1
+        self.pivot = layer.pivot
+        self.pnts_count = 0
+        self.pols_count = 0
+        self.bones_count = 0
+        return lwoLayer(
+            self.layer,
+            layer.index,
+            layer.name,
+            layer.pivot,
+            layer.parent_index,
+            hidden,
+        )
+
+    def records(self, rootchunk):
+        if self.form == b"LWO2":
+            return self.lwo2_records(rootchunk)
+        return self.lwob_records(rootchunk)
+
+    def points(self, pnt_bytes):
+        pnts = read_pnts_array(pnt_bytes, self.pivot)
+        record = lwoPoints(self.layer, self.pnts_count, pnts)
+        self.pnts_count += len(pnts)
+        return record
+
+    def lwo2_records(self, rootchunk):
+        name = rootchunk.chunkname
+        if name == b"TAGS":
+            lwo = SimpleNamespace(tags=[])
+            read_tags(rootchunk.read(), lwo)
+            yield lwoTags(lwo.tags)
+        elif name == b"LAYR":
+            layr_bytes = rootchunk.read()
+            layers = []
+            read_layr(layr_bytes, layers, True)
+            (flags,) = struct.unpack(">H", layr_bytes[2:4])
+            record = self.start_layer(layers[-1], flags > 0)
+            if record is not None:
+                yield record
+        elif name == b"SURF":
+            lwo = SimpleNamespace(surfs={})
+            read_surf(rootchunk.read(), lwo)
+            for surf in lwo.surfs.values():
+                yield lwoSurface(surf)
+        elif name == b"CLIP":
+            lwo = SimpleNamespace(clips={})
+            read_clip(rootchunk.read(), lwo)
+            for c_id, path in lwo.clips.items():
+                yield lwoClip(c_id, path)
+        elif not self.handle_layer or self.layer < 0:
+            rootchunk.skip()
+        elif name == b"PNTS":
+            yield self.points(rootchunk.read())
+        elif name == b"POLS":
+            kind = bytes(rootchunk.read(4))
+            values = read_vx_array(rootchunk.read(), self.split)
+            heads, indices, offsets = read_pols_array(values, split_size=self.split)
+            if kind == b"BONE":
+                yield lwoPolygons(self.layer, kind, self.bones_count, indices, offsets)
+                self.bones_count += len(heads)
+            else:
+                yield lwoPolygons(self.layer, kind, self.pols_count, indices, offsets)
+                self.pols_count += len(heads)
+                self.last_pols_count = len(heads)
+        elif name == b"PTAG":
+            kind = bytes(rootchunk.read(4))
+            pol_ids, tags = read_ptag_array(rootchunk.read())
+            if kind != b"BONE" and kind != b"BNUP":
+                pol_ids += self.pols_count - self.last_pols_count
+            yield lwoPTag(self.layer, kind, pol_ids, tags)
+        elif name == b"VMAP" or name == b"VMAD":
+            kind = bytes(rootchunk.read(4))
+            if not self.use_map(name, kind):
+                rootchunk.skip()
+                return
+            map_bytes = rootchunk.read()
+            (dim,) = struct.unpack(">H", map_bytes[0:2])
+            map_name, offset = read_lwostring(map_bytes, 2)
+            if name == b"VMAP":
+                (pnt_ids,), values = read_vx_records(
+                    map_bytes, offset, 1, dim, self.split
+                )
+                yield lwoVMap(self.layer, kind, map_name, dim, pnt_ids, values)
+            else:
+                (pnt_ids, pol_ids), values = read_vx_records(
+                    map_bytes, offset, 2, dim, self.split
+                )
+                pol_ids += self.pols_count - self.last_pols_count
+                yield lwoVMad(
+                    self.layer, kind, map_name, dim, pnt_ids, pol_ids, values
+                )
+        else:
+            rootchunk.skip()
+
+    def lwob_records(self, rootchunk):
+        name = rootchunk.chunkname
+        if name == b"SRFS":
+            lwo = SimpleNamespace(tags=[])
+            read_tags(rootchunk.read(), lwo)
+            yield lwoTags(lwo.tags)
+        elif name == b"SURF":
+            lwo = SimpleNamespace(surfs={}, clips={})
+            read_surf_5(rootchunk.read(), lwo)
+            for surf in lwo.surfs.values():
+                yield lwoSurface(surf)
+            for c_id, path in lwo.clips.items():
+                yield lwoClip(c_id, path)
+        elif name == b"LAYR":
+            layers = []
+            read_layr_5(rootchunk.read(), layers)
+            record = self.start_layer(layers[-1], False)
+            if record is not None:
+                yield record
+        elif name == b"PNTS" and self.layer < 0 and self.handle_layer:
+            # LWOB files have no LAYR chunk to set this up.
+            layer = _obj_layer()
+            layer.name = "Layer 1"
+            record = self.start_layer(layer, False)
+            if record is not None:
+                yield record
+                yield self.points(rootchunk.read())
+        elif not self.handle_layer:
+            rootchunk.skip()
+        elif name == b"PNTS":
+            yield self.points(rootchunk.read())
+        elif name == b"POLS" or name == b"PCHS":
+            pol_bytes = rootchunk.read()
+            heads, indices, offsets, sids = read_pols_5_array(pol_bytes, self.split)
+            kind = b"FACE" if name == b"POLS" else b"PTCH"
+            first = self.pols_count
+            yield lwoPolygons(self.layer, kind, first, indices, offsets)
+            self.pols_count += len(heads)
+            self.last_pols_count = len(heads)
+            valid = sids >= 0  # Surface 0 doesn't exist.
+            pol_ids = np.arange(first, first + len(sids))[valid]
+            yield lwoPTag(self.layer, b"SURF", pol_ids, sids[valid])
+        else:
+            rootchunk.skip()
+
+
+def iter_records(filename, ch=None):
+    """Yield the records of an LWO file, one chunk at a time.
+
+    Nothing is kept from one chunk to the next, so the memory used is
+    bounded by the biggest chunk and whatever the caller holds on to.  ch,
+    the import options, can leave out layers and maps as lwoObject would.
+    """
+    with open_lwo(filename) as f:
+        try:
+            header, _, form = struct.unpack(">4s1L4s", f.read(12))
+        except struct.error:
+            msg = "Error parsing file header! Filename {}".format(filename)
+            raise lwoUnsupportedFileException(msg) from None
+        if header != b"FORM" or form not in (b"LWO2", b"LWOB", b"LWLO"):
+            msg = "Invalid LWO File Type: {}".format(filename)
+            raise lwoUnsupportedFileException(msg)
+
+        reader = _record_reader(form, ch)
+        while True:
+            try:
+                rootchunk = Chunk(f)
+            except EOFError:
+                break
+            yield from reader.records(rootchunk)
@@ -0,0 +1,546 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import os
+import bpy
+from bpy_extras.io_utils import ImportHelper
+from bpy.types import Operator, AddonPreferences
+from bpy.props import StringProperty, BoolProperty, IntProperty, CollectionProperty
+
+from .lwoObject import (
+    lwoObject,
+    lwoNoImageFoundException,
+    lwoUnsupportedFileException,
+    _choices,
+    DEFAULT_SPLIT_CHUNK_SIZE,
+)
+from .lwoCache import lwoCache, session_cache
+from .lwoImages import image_cache, DEFAULT_IMAGE_EXTENSIONS
+from .lwoBatch import read_files
+from .construct_mesh import build_objects, finish_streamed, stream_objects
+
+
+def _layer_list(text):
+    """Split the LAYERS option into layer numbers and names."""
+    layers = []
+    for item in text.split(","):
+        item = item.strip()
+        if item.isdigit():
+            layers.append(int(item))
+        elif item:
+            layers.append(item)
+    return layers
+
+
+def _name_list(text):
+    """Split a comma separated option into its names."""
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def _release_import():
+    """Drop the references to the last import, so its data can be freed."""
+    lwo = bpy.types.Scene.lwo
+    if lwo is not None and lwo.objects:
+        # Its objects were streamed, or built, but never finished.
+        finish_streamed(lwo)
+    bpy.types.Scene.lwo = None
+    if bpy.types.Scene.ch is not None:
+        bpy.types.Scene.ch.images = {}
+        bpy.types.Scene.ch.loaded_images = {}
+
+
+def _finish_import():
+    """Build the waiting import without the images that weren't found."""
+    lwo = bpy.types.Scene.lwo
+    if lwo is None:
+        return
+    ch = bpy.types.Scene.ch
+    cancel_search = ch.cancel_search
+    ch.cancel_search = True
+    try:
+        lwo.resolve_clips()
+        lwo.validate_lwo()
+        build_objects(lwo, ch)
+    finally:
+        ch.cancel_search = cancel_search
+        _release_import()
+
+
+def _apply_preferences(context):
+    """Pass the add-on preferences on to the session cache."""
+    addon = context.preferences.addons.get(__package__)
+    if addon is None:
+        return
+    session_cache.max_size = addon.preferences.session_cache_size * 1024 ** 2
+    session_cache.evict()
+
+
+def _update_session_cache_size(self, context):  # gui: no cover
+    _apply_preferences(context)
+
+
+class LWO_AddonPreferences(AddonPreferences):
+    bl_idname = __package__
+
+    session_cache_size: IntProperty(
+        name="Memory Cache Size (MB)",
+        description="How much memory to keep parsed files in, so importing "
+        "them again doesn't read them again. The files are kept for the rest "
+        "of the session, 0 turns it off",
+        default=0,
+        min=0,
+        update=_update_session_cache_size,
+    )
+    workers: IntProperty(
+        name="Import Processes",
+        description="How many files to parse at once when importing several, "
+        "0 uses one per CPU core",
+        default=0,
+        min=0,
+    )
+
+    def draw(self, context):  # gui: no cover
+        layout = self.layout
+        layout.prop(self, "session_cache_size")
+        layout.prop(self, "workers")
+        row = layout.row()
+        row.label(text=f"{len(session_cache)} files in memory")
+        row.operator(IMPORT_OT_lwo_clear_cache.bl_idname)
+
+
+class IMPORT_OT_lwo_clear_cache(Operator):
+    """Forget the LWO files parsed in this session"""
+
+    bl_idname = "import_scene.lwo_clear_cache"
+    bl_label = "Clear LWO Cache"
+
+    disk: BoolProperty(
+        name="Clear Disk Cache",
+        description="Also remove the files and image searches cached on disk",
+        default=False,
+    )
+
+    def execute(self, context):
+        session_cache.clear()
+        if self.disk:
+            ch = bpy.types.Scene.ch
+            lwoCache(ch.cache_dir, ch.cache_size).clear()
+            image_cache.clear()
+        return {"FINISHED"}
+
+
+class WM_OT_messagebox(Operator):
+    bl_idname = "wm.messagebox"
+    bl_label = ""
+
+    message: bpy.props.StringProperty(
+        name="message",
+        description="message",
+        default="",
+    )
+    ob: bpy.props.BoolProperty(
+        name="ob",
+        description="ob",
+        default=False,
+    )
+
+    def invoke(self, context, event):  # gui: no cover
+        return context.window_manager.invoke_props_dialog(self, width=400)
+
+    def execute(self, context):  # gui: no cover
+        self.report({"INFO"}, self.message)
+        if self.ob:
+            bpy.ops.wm.lwo_open_browser("INVOKE_DEFAULT")
+        return {"FINISHED"}
+
+    def cancel(self, context):  # gui: no cover
+        if self.ob:
+            _finish_import()
+
+    def draw(self, context):  # gui: no cover
+        self.layout.label(text=self.message)
+        self.layout.label(text="")
+
+
+class WM_OT_lwo_file_browser(Operator):
+    bl_idname = "wm.lwo_open_browser"
+    bl_label = "Select Image Search Path"
+    bl_options = {"REGISTER", "UNDO"}
+
+    directory: StringProperty(subtype="DIR_PATH")
+    recursive: BoolProperty(
+        name="Recursive Search",
+        description="Uncheck to disable recursive search",
+        default=True,
+    )
+    search_depth: IntProperty(
+        name="Search Depth",
+        description="How many levels of folders to search below the chosen one, "
+        "0 for all of them",
+        default=0,
+        min=0,
+    )
+    ignore: StringProperty(
+        name="Ignore",
+        description="Comma separated names or globs of the files and folders "
+        "not to search, such as .git, cache, *.blend1",
+        default="",
+    )
+    extensions: StringProperty(
+        name="Image Types",
+        description="Comma separated file extensions to look at, leave empty "
+        "to look at every file",
+        default=", ".join(DEFAULT_IMAGE_EXTENSIONS),
+    )
+    cancel_search: BoolProperty(
+        name="Cancel Search",
+        description="If no further images are to be found",
+        default=False,
+    )
+
+    def invoke(self, context, event):  # gui: no cover
+        wm = context.window_manager
+        wm.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):  # gui: no cover
+        lwo = bpy.types.Scene.lwo
+        ch = bpy.types.Scene.ch
+
+        ch.search_paths.append(self.directory)
+        ch.cancel_search = self.cancel_search
+        ch.recursive = self.recursive
+        ch.search_depth = self.search_depth
+        ch.search_ignore = _name_list(self.ignore)
+        ch.image_extensions = _name_list(self.extensions) or None
+        try:
+            lwo.resolve_clips()
+            lwo.validate_lwo()
+            build_objects(lwo, ch)
+        except lwoNoImageFoundException as err:
+            bpy.ops.wm.messagebox("INVOKE_DEFAULT", message=str(err), ob=True)
+        except Exception as err:
+            _release_import()
+            self.report({"ERROR"}, f"Browser operation failed: {err}")
+            return {"CANCELLED"}
+        else:
+            _release_import()
+
+        return {"FINISHED"}
+
+    def cancel(self, context):  # gui: no cover
+        _finish_import()
+
+
+class IMPORT_OT_lwo(Operator, ImportHelper):
+    """Import LWO Operator"""
+
+    bl_idname = "import_scene.lwo"
+    bl_label = "Import LWO"
+    bl_description = "Import a LightWave Object file"
+    bl_options = {"REGISTER", "UNDO"}
+    filepath: StringProperty(subtype="FILE_PATH")
+    filter_glob: StringProperty(default="*.lwo;*.lwo2", options={"HIDDEN"})
+    files: CollectionProperty(
+        type=bpy.types.OperatorFileListElement,
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+    directory: StringProperty(subtype="DIR_PATH", options={"HIDDEN", "SKIP_SAVE"})
+
+    file_handler = {
+        "extensions": [".lwo", ".lwo2"],
+    "blender": (2, 81, 0),
+    }
+
+    bpy.types.Scene.ch = None
+    bpy.types.Scene.lwo = None
+
+    ADD_SUBD_MOD: BoolProperty(
+        name="Apply SubD Modifier",
+        description="Apply the Subdivision Surface modifier to layers with Subpatches",
+        default=True,
+    )
+    LOAD_HIDDEN: BoolProperty(
+        name="Load Hidden Layers",
+        description="Load object layers that have been marked as hidden",
+        default=False,
+    )
+    SKEL_TO_ARM: BoolProperty(
+        name="Create Armature",
+        description="Create an armature from an embedded Skelegon rig",
+        default=True,
+    )
+    USE_EXISTING_MATERIALS: BoolProperty(
+        name="Use Existing Materials",
+        description="Use existing materials if a material by that name already exists",
+        default=False,
+    )
+    LAYERS: StringProperty(
+        name="Layers",
+        description="Comma separated layer numbers (the first layer is 0) or names "
+        "to load, leave empty to load all layers",
+        default="",
+    )
+    LOAD_MORPHS: BoolProperty(
+        name="Load Morphs",
+        description="Create shape keys from the endomorphs",
+        default=True,
+    )
+    LOAD_VERTEX_COLORS: BoolProperty(
+        name="Load Vertex Colors",
+        description="Load the vertex color maps",
+        default=True,
+    )
+    LOAD_WEIGHTS: BoolProperty(
+        name="Load Weight Maps",
+        description="Create vertex groups from the weight maps",
+        default=True,
+    )
+    LOAD_NORMALS: BoolProperty(
+        name="Load Custom Normals",
+        description="Load the vertex normal maps",
+        default=True,
+    )
+    USE_CACHE: BoolProperty(
+        name="Use Cache",
+        description="Keep the parsed file in Blender's cache directory, so it "
+        "loads faster the next time it is imported",
+        default=False,
+    )
+    STREAM: BoolProperty(
+        name="Build While Reading",
+        description="Build each layer as soon as it is read and let go of its "
+        "data, to use less memory on objects with many layers. The file isn't "
+        "cached",
+        default=False,
+    )
+    READ_AHEAD: IntProperty(
+        name="Read Ahead (MB)",
+        description="Read the file ahead of its use on a separate thread, in "
+        "blocks of this size, for files on slow network storage. 0 turns it off",
+        default=0,
+        min=0,
+    )
+    SPLIT_CHUNK_SIZE: IntProperty(
+        name="Split Chunks Over (MB)",
+        description="Decode polygon and map chunks bigger than this on several "
+        "threads. 0 decodes every chunk on one thread",
+        default=DEFAULT_SPLIT_CHUNK_SIZE // 1024 ** 2,
+        min=0,
+    )
+    SHARE_MATERIALS: BoolProperty(
+        name="Share Materials",
+        description="Use one material for surfaces with the same name, settings "
+        "and images, in this import and earlier ones",
+        default=False,
+    )
+
+    def invoke(self, context, event):  # gui: no cover
+        wm = context.window_manager
+        wm.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        _apply_preferences(context)
+
+        ch = bpy.types.Scene.ch
+        ch.add_subd_mod = self.ADD_SUBD_MOD
+        ch.load_hidden = self.LOAD_HIDDEN
+        ch.skel_to_arm = self.SKEL_TO_ARM
+        ch.use_existing_materials = self.USE_EXISTING_MATERIALS
+        ch.layers = _layer_list(self.LAYERS)
+        ch.load_morphs = self.LOAD_MORPHS
+        ch.load_vertex_colors = self.LOAD_VERTEX_COLORS
+        ch.load_weights = self.LOAD_WEIGHTS
+        ch.load_normals = self.LOAD_NORMALS
+        ch.use_cache = self.USE_CACHE
+        ch.read_ahead = self.READ_AHEAD * 1024 ** 2
+        ch.split_chunk_size = self.SPLIT_CHUNK_SIZE * 1024 ** 2
+        # Streamed meshes keep their surfaces in an attribute until the end.
+        ch.stream = self.STREAM and "attributes" in bpy.types.Mesh.bl_rna.properties
+        ch.share_materials = self.SHARE_MATERIALS
+        ch.images = {}
+        # Shared by all the files, so each image is only loaded once.
+        ch.loaded_images = {}
+
+        filepaths = self.filepaths()
+        if len(filepaths) > 1:
+            return self.import_files(filepaths, ch)
+
+        lwo = lwoObject(filepaths[0])
+        bpy.types.Scene.lwo = lwo
+
+        try:
+            if ch.stream:
+                stream_objects(lwo, ch)
+            else:
+                lwo.read(ch)
+        except lwoUnsupportedFileException as err:
+            if bpy.app.background:
+                _release_import()
+                raise err
+            else:
+                bpy.ops.wm.messagebox(
+                    "INVOKE_DEFAULT", message=str(err)
+                )  # gui: no cover
+        except Exception as err:
+            _release_import()
+            self.report({"ERROR"}, f"Browser operation failed: {err}")
+            return {"CANCELLED"}
+
+        # Image handling in Lightwave files presents a portability challenge.
+        # Lightwave images are typically stored with explicit filenames, making
+        # it difficult to move projects between different systems or directories
+        # without breaking image links.  This plugin addresses this issue by:
+        #
+        # - When an image file reference is encountered but the image is missing:
+        #   A Blender file browser dialog will open, prompting the user to select
+        #   a directory to search for missing images.
+        #
+        # - Directory Search and Multiple Prompts:
+        #   If images are found in the selected directory, the import continues.
+        #   If not all missing images are resolved after the first directory selection,
+        #   the dialog will re-open, allowing the user to select another directory.
+        #   This process repeats until either:
+        #     a) All missing images are located across the selected directories.
+        #     b) The user cancels the dialog.
+        #
+        # - Import Completion:
+        #   The import process will complete even if not all images are found. In cases
+        #   where images remain unresolved after directory searching or if the dialog
+        #   is cancelled, the import will still finish, but without the missing image
+        #   textures being loaded.
+        try:
+            lwo.resolve_clips()
+            lwo.validate_lwo()
+            build_objects(lwo, ch)
+        except lwoNoImageFoundException as err:
+            if bpy.app.background:
+                _release_import()
+                raise err
+            else:
+                bpy.ops.wm.messagebox(
+                    "INVOKE_DEFAULT", message=str(err), ob=True
+                )  # gui: no cover
+        except Exception as err:
+            _release_import()
+            self.report({"ERROR"}, f"Browser operation failed: {err}")
+            return {"CANCELLED"}
+        else:
+            # The file browser needs it if an image is missing, else let go.
+            _release_import()
+
+        return {"FINISHED"}
+
+    def filepaths(self):
+        """The chosen files, or just filepath if there aren't any."""
+        names = [f.name for f in self.files if f.name]
+        if not names:
+            return [self.filepath]
+        directory = self.directory or os.path.dirname(self.filepath)
+        return [os.path.join(directory, name) for name in names]
+
+    def import_files(self, filepaths, ch):
+        """Parse the files in worker processes, and build each one as soon as
+        it has been parsed."""
+        prefs = bpy.context.preferences.addons.get(__package__)
+        workers = prefs.preferences.workers if prefs is not None else 0
+        try:
+            for lwo in read_files(filepaths, ch, workers or None):
+                bpy.types.Scene.lwo = lwo
+                ch.images = {}
+                try:
+                    lwo.resolve_clips()
+                except lwoNoImageFoundException as err:
+                    if bpy.app.background:
+                        raise err
+                    # Don't stop the batch, build it without the images.
+                    self.report({"WARNING"}, str(err))  # gui: no cover
+                lwo.validate_lwo()
+                build_objects(lwo, ch)
+        except (lwoUnsupportedFileException, lwoNoImageFoundException) as err:
+            if bpy.app.background:
+                raise err
+            self.report({"ERROR"}, str(err))  # gui: no cover
+            return {"CANCELLED"}  # gui: no cover
+        except Exception as err:
+            self.report({"ERROR"}, f"Import failed: {err}")
+            return {"CANCELLED"}
+        finally:
+            _release_import()
+        return {"FINISHED"}
+
+    def menu_func(self, context):  # gui: no cover
+        self.layout.operator(IMPORT_OT_lwo.bl_idname, text="LightWave Object (.lwo)")
+
+
+# Panel
+class IMPORT_PT_Debug(bpy.types.Panel):
+    bl_idname = "IMPORT_PT_Debug"
+
+    # region = "UI"
+    region = "WINDOW"
+    # region = "TOOLS"
+    space = "PROPERTIES"
+
+    bl_label = "DEBUG"
+    bl_space_type = space
+    bl_region_type = region
+    bl_category = "Tools"
+
+    def draw(self, context):  # gui: no cover
+        layout = self.layout
+
+        col = layout.column(align=True)
+        col.operator("import_scene.lwo", text="Import LWO")
+        col.operator("wm.lwo_open_browser", text="File Browser")
+
+
+classes = (
+    LWO_AddonPreferences,
+    IMPORT_OT_lwo,
+    IMPORT_OT_lwo_clear_cache,
+    WM_OT_lwo_file_browser,
+    WM_OT_messagebox,
+)
+
+
+def register():
+
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    bpy.types.TOPBAR_MT_file_import.append(IMPORT_OT_lwo.menu_func)
+
+    ch = _choices()
+    bpy.types.Scene.ch = ch
+
+
+def unregister():  # pragma: no cover
+
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
+
+    bpy.types.TOPBAR_MT_file_import.remove(IMPORT_OT_lwo.menu_func)
+
+    del bpy.types.Scene.ch
+    session_cache.clear()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    register()
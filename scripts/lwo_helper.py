@@ -28,6 +28,16 @@ class ImportFile:
             "LOAD_HIDDEN",
             "SKEL_TO_ARM",
             "USE_EXISTING_MATERIALS",
+            "LAYERS",
+            "LOAD_MORPHS",
+            "LOAD_VERTEX_COLORS",
+            "LOAD_WEIGHTS",
+            "LOAD_NORMALS",
+            "USE_CACHE",
+            "READ_AHEAD",
+            "SPLIT_CHUNK_SIZE",
+            "STREAM",
+            "SHARE_MATERIALS",
         ]
         for k in self.kwlist:
             if k in self.kwargs.keys():
@@ -51,6 +61,8 @@ class ImportFile:
             self.recursive = kwargs["recursive"]
         else:
             self.recursive = True
+        # Import all the files with one call, parsing them in parallel.
+        self.batch = self.kwargs.get("batch", False)
 
         self.infile = self.infiles[0]
         self.check_blend = False
@@ -154,6 +166,18 @@ class ImportFile:
             shutil.rmtree(z)
 
     def import_objects(self):
+        if self.batch:
+            ch = bpy.types.Scene.ch
+            ch.search_paths.extend(self.search_paths)
+            ch.cancel_search = self.cancel_search
+            ch.recursive = self.recursive
+            bpy.ops.import_scene.lwo(
+                files=[{"name": os.path.abspath(f)} for f in self.infiles],
+                *self.lw_args,
+                **self.lw_kwargs,
+            )
+            return
+
         for infile in self.infiles:
             ch = bpy.types.Scene.ch
             ch.search_paths.extend(self.search_paths)
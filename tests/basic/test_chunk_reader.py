@@ -0,0 +1,78 @@
+import io
+import time
+import numpy as np
+from io_scene_lwo.chunk import Chunk, BufferFile, ChunkReader
+from io_scene_lwo.lwoObject import lwoObject, _choices
+
+
+class SlowFile(io.BytesIO):
+    """A file that takes a while to answer each read, like one on a network
+    share."""
+
+    def __init__(self, data, delay=0.001):
+        super().__init__(data)
+        self.delay = delay
+        self.reads = []
+
+    def read(self, size=-1):
+        time.sleep(self.delay)
+        self.reads.append(size)
+        return super().read(size)
+
+
+def chunk_file():
+    parts = []
+    for i, size in enumerate((4, 7, 300, 0, 5000, 1)):
+        parts.append(b"CH%02d" % i + size.to_bytes(4, "big") + bytes([i]) * size)
+        if size & 1:
+            parts.append(b"\0")
+    parts.append(b"TAIL")  # Too short to be a chunk.
+    return b"".join(parts)
+
+
+def test_chunk_reader():
+    data = chunk_file()
+    expected = []
+    f = io.BytesIO(data)
+    while True:
+        try:
+            chunk = Chunk(f)
+        except EOFError:
+            break
+        expected.append((chunk.chunkname, bytes(chunk.read())))
+
+    f = SlowFile(data)
+    found = []
+    with ChunkReader(f, read_ahead=256, queue_depth=2) as reader:
+        for buffer in reader:
+            try:
+                chunk = Chunk(BufferFile(buffer))
+            except EOFError:
+                break
+            found.append((chunk.chunkname, bytes(chunk.read())))
+    assert found == expected
+    assert max(f.reads) <= 256
+
+
+def test_chunk_reader_queue_depth():
+    f = SlowFile(chunk_file(), delay=0)
+    with ChunkReader(f, read_ahead=16, queue_depth=2) as reader:
+        time.sleep(0.2)
+        # The reader waits for the chunks to be used.
+        assert reader.queue.qsize() == 2
+        assert f.tell() < len(f.getvalue())
+
+
+def test_lwo_read_ahead():
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    whole = lwoObject(infile)
+    whole.read(_choices(USE_SESSION_CACHE=False))
+    ahead = lwoObject(infile)
+    ahead.read(_choices(USE_SESSION_CACHE=False, READ_AHEAD=64, QUEUE_DEPTH=1))
+    assert [layer.name for layer in ahead.layers] == [
+        layer.name for layer in whole.layers
+    ]
+    for a, b in zip(whole.layers, ahead.layers):
+        assert np.array_equal(a.pnts, b.pnts)
+        assert np.array_equal(a.pols.indices, b.pols.indices)
+    assert ahead.surfs.keys() == whole.surfs.keys()
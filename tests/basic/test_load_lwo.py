@@ -26,6 +26,74 @@ def test_load_lwo_box3_uv_layers():
     load_lwo(infile)
 
 
+def test_load_lwo_box3_uv_layers_stream():
+    # Built a layer at a time, but the same as the whole file at once.
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    load_lwo(infile, STREAM=True)
+
+
+def streamed_meshes_finished():
+    import bpy
+
+    meshes = [o.data for o in bpy.context.scene.objects if o.type == "MESH"]
+    assert meshes
+    assert all("lwo_surf" not in me.attributes for me in meshes)
+    return meshes
+
+
+def test_load_lwo_stream_cancel_search():
+    import bpy
+    from blend_helper import delete_everything
+
+    # The image isn't found and the search is cancelled, the streamed mesh
+    # still gets its material.
+    infile = "tests/basic/src/LWO2/naming/box0.lwo"
+    delete_everything()
+    bpy.types.Scene.ch.cancel_search = True
+    try:
+        bpy.ops.import_scene.lwo(filepath=infile, STREAM=True)
+        assert all(len(me.materials) for me in streamed_meshes_finished())
+        assert bpy.types.Scene.lwo is None
+    finally:
+        bpy.types.Scene.ch.cancel_search = False
+        delete_everything()
+
+
+def test_load_lwo_stream_missing_image():
+    import bpy
+    from blend_helper import delete_everything
+
+    # The import stops at the missing image, after the mesh was streamed.
+    infile = "tests/basic/src/LWO2/naming/box0.lwo"
+    delete_everything()
+    try:
+        with pytest.raises(Exception):
+            bpy.ops.import_scene.lwo(filepath=infile, STREAM=True)
+        streamed_meshes_finished()
+        assert bpy.types.Scene.lwo is None
+    finally:
+        delete_everything()
+
+
+def test_load_lwo_box3_uv_layers_select():
+    import bpy
+    from blend_helper import delete_everything
+
+    # There's no reference blend for this, check the objects themselves.
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    delete_everything()
+    try:
+        bpy.ops.import_scene.lwo(
+            filepath=infile, LAYERS="0, Layer 10", LOAD_MORPHS=False
+        )
+        objects = bpy.context.scene.objects
+        # Layer 0 is called Layer 1, Layer 2 is left out.
+        assert sorted(o.name for o in objects) == ["Layer 1", "Layer 10"]
+        assert all(o.data.shape_keys is None for o in objects)
+    finally:
+        delete_everything()
+
+
 def test_load_lwo_box5_ngon():
     infile = "tests/basic/src/LWO2/box/box5-ngon.lwo"
     load_lwo(infile)
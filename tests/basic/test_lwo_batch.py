@@ -0,0 +1,49 @@
+import os
+import sys
+import subprocess
+import pytest
+
+FILES = [
+    "tests/basic/src/LWO2/box/box1.lwo",
+    "tests/basic/src/LWO2/box/box3-uv-layers.lwo",
+    "tests/basic/src/LWO/box/box2-uv.lwo",
+]
+
+# Run as a script, as blender -b --python job.py runs one.  Spawned workers
+# run it again as __mp_main__, where importing bpy would fail.
+SCRIPT = """
+import sys
+if __name__ == "__mp_main__" and {fail_in_workers}:
+    raise ImportError("No module named 'bpy'")
+
+from io_scene_lwo.lwoObject import lwoObject, _choices
+from io_scene_lwo.lwoBatch import read_files
+
+if __name__ == "__main__":
+    ch = _choices(USE_SESSION_CACHE=False)
+    files = sys.argv[1:]
+    for filename, lwo in zip(files, read_files(files, ch, max_workers=2)):
+        serial = lwoObject(filename)
+        serial.read(_choices(USE_SESSION_CACHE=False))
+        assert lwo.layers == serial.layers, filename
+        assert lwo.surfs == serial.surfs, filename
+    print("read", len(files))
+"""
+
+
+@pytest.mark.parametrize("fail_in_workers", [False, True])
+def test_lwo_read_files_script(tmp_path, fail_in_workers):
+    script = tmp_path / "job.py"
+    script.write_text(SCRIPT.format(fail_in_workers=fail_in_workers))
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    result = subprocess.run(
+        [sys.executable, str(script)] + FILES,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert f"read {len(FILES)}" in result.stdout
+    failed = "worker processes failed" in result.stdout
+    assert failed == fail_in_workers
@@ -0,0 +1,74 @@
+import numpy as np
+import os
+from io_scene_lwo.lwoObject import lwoObject, _choices
+from io_scene_lwo.lwoCache import lwoSessionCache, session_cache
+
+
+def read_cached(infile, cache_dir, **kwargs):
+    ch = _choices(USE_CACHE=True, USE_SESSION_CACHE=False, **kwargs)
+    ch.cache_dir = str(cache_dir)
+    lwo = lwoObject(infile)
+    lwo.read(ch)
+    return lwo
+
+
+def test_lwo_cache_hit(tmp_path):
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    first = read_cached(infile, tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    second = read_cached(infile, tmp_path)
+    assert second.tags == first.tags
+    assert second.clips == first.clips
+    assert [layer.name for layer in second.layers] == [
+        layer.name for layer in first.layers
+    ]
+    for a, b in zip(first.layers, second.layers):
+        assert np.array_equal(a.pnts, b.pnts)
+        assert np.array_equal(a.pols.indices, b.pols.indices)
+        assert np.array_equal(a.surf_ids, b.surf_ids)
+
+
+def test_lwo_cache_options(tmp_path):
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    read_cached(infile, tmp_path)
+    lwo = read_cached(infile, tmp_path, LAYERS=[0])
+    assert len(lwo.layers) == 1
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_lwo_session_cache(tmp_path, monkeypatch):
+    # It is off unless the preferences give it a size.
+    monkeypatch.setattr(session_cache, "max_size", 64 * 1024 ** 2)
+    infile = tmp_path / "box.lwo"
+    with open("tests/basic/src/LWO2/box/box3-uv-layers.lwo", "rb") as f:
+        infile.write_bytes(f.read())
+    first = lwoObject(str(infile))
+    first.read(_choices())
+    second = lwoObject(str(infile))
+    second.read(_choices())
+    assert second.layers[0] is not first.layers[0]
+    assert second.layers[0].pnts is first.layers[0].pnts
+
+    first.layers[1].uvmaps_vmap = {}
+    assert list(second.layers[1].uvmaps_vmap) == ["Texture"]
+
+    st = os.stat(infile)
+    os.utime(infile, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    third = lwoObject(str(infile))
+    third.read(_choices())
+    assert third.layers[0].pnts is not first.layers[0].pnts
+
+    session_cache.invalidate(str(infile))
+    key = session_cache.key(infile, _choices().parse_options())
+    assert session_cache.load(key) is None
+
+
+def test_lwo_session_cache_off():
+    # By default nothing outlives the import.
+    cache = lwoSessionCache()
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    key = cache.key(infile)
+    cache.store(key, {"pnts": np.zeros((8, 3), dtype=np.float32)})
+    assert cache.load(key) is None
+    assert len(cache) == 0
@@ -0,0 +1,25 @@
+from io_scene_lwo.lwo import main
+
+
+def test_lwo_cli(capsys):
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    for command in ("inspect", "stats", "dump"):
+        assert main([command, infile]) == 0
+
+    main(["stats", infile])
+    out = capsys.readouterr().out
+    assert "3 layers" in out
+    assert "798 points, 864 polygons" in out
+    assert "1 uv maps" in out
+
+
+def test_lwo_cli_bad_file(capsys):
+    assert main(["stats", "tests/basic/src/LWO2/box/missing.lwo"]) == 1
+    assert "missing.lwo" in capsys.readouterr().err
+
+
+def test_lwo_cli_truncated_file(tmp_path, capsys):
+    infile = tmp_path / "short.lwo"
+    infile.write_bytes(b"FORM\0\0")
+    assert main(["stats", str(infile)]) == 1
+    assert "Error parsing file header" in capsys.readouterr().err
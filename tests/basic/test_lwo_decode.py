@@ -0,0 +1,119 @@
+import struct
+import numpy as np
+from io_scene_lwo.lwoObject import (
+    _obj_layer,
+    read_pols,
+    read_pols_array,
+    read_uv_vmad,
+    read_uvmap,
+    read_vx_array,
+    read_weight_vmad,
+)
+
+
+def vx_bytes(*words):
+    return np.array(words, dtype=">u2").tobytes()
+
+
+def test_read_vx_array():
+    # Two byte indexes, up to the highest one.
+    assert read_vx_array(vx_bytes(0, 1, 0x1234, 0xFEFF)).tolist() == [
+        0,
+        1,
+        0x1234,
+        0xFEFF,
+    ]
+    # A run of four byte indexes, starting at 0xFF00 which is index 0.  Low
+    # words of 0xFF00 and up look like start words but aren't.
+    words = vx_bytes(0xFF00, 0x0000, 0xFF01, 0xFF02, 0xFFFF, 0xFFFF, 0xFF00, 0xFF00)
+    assert read_vx_array(words).tolist() == [0, 0x1FF02, 0xFFFFFF, 0xFF00]
+    # Mixed widths.
+    words = vx_bytes(5, 0xFF01, 0x0002, 7, 0xFF00, 0xFF00, 0xFEFF)
+    assert read_vx_array(words).tolist() == [5, 0x10002, 7, 0xFF00, 0xFEFF]
+    # A four byte index cut short is left out, as is an odd last byte.
+    assert read_vx_array(vx_bytes(5, 0xFF01)).tolist() == [5]
+    assert read_vx_array(vx_bytes(0xFF01, 0xFF02, 0xFF03)).tolist() == [0x1FF02]
+    assert read_vx_array(vx_bytes(5) + b"\xff").tolist() == [5]
+    assert read_vx_array(b"").tolist() == []
+
+
+
+def decode_pols(*words):
+    heads, indices, offsets = read_pols_array(read_vx_array(vx_bytes(*words)))
+    counts = np.diff(offsets).tolist()
+    pols = [indices[a:b].tolist() for a, b in zip(offsets[:-1], offsets[1:])]
+    return heads.tolist(), counts, pols
+
+
+def test_read_pols_array():
+    # Polygons with no points are kept, empty.
+    assert decode_pols(3, 1, 2, 3, 0, 2, 4, 5, 0) == (
+        [0, 4, 5, 8],
+        [3, 0, 2, 0],
+        [[3, 2, 1], [], [5, 4], []],
+    )
+    # The top six bits of the count are flags.
+    assert decode_pols(0xFC00 | 2, 7, 8, 0x0400 | 3, 1, 2, 3)[2] == [
+        [8, 7],
+        [3, 2, 1],
+    ]
+    # Four byte point indexes.
+    heads, counts, pols = decode_pols(2, 0xFF01, 0x0000, 9, 3, 0xFF00, 0xFF00, 1, 2)
+    assert heads == [0, 3]
+    assert pols == [[9, 0x10000], [2, 1, 0xFF00]]
+    # A last polygon with points missing is left out.
+    assert decode_pols(3, 1, 2, 3, 4, 1, 2) == ([0], [3], [[3, 2, 1]])
+    assert decode_pols(2, 1, 0xFF01) == ([], [], [])
+
+
+def uv_records(name, *records):
+    """The body of a TXUV VMAP or VMAD, records being indexes then a UV."""
+    data = struct.pack(">H", 2) + name.encode() + b"\0\0"
+    for record in records:
+        *ids, u, v = record
+        data += vx_bytes(*ids) + struct.pack(">2f", u, v)
+    return data
+
+
+def test_vmap_later_chunk_wins():
+    layer = _obj_layer()
+    layer.name = "Layer 1"
+    read_uvmap(uv_records("UV", (1, 0.1, 0.1), (2, 0.2, 0.2), (2, 0.3, 0.3)), [layer])
+    read_uvmap(uv_records("UV", (3, 0.4, 0.4), (1, 0.5, 0.5)), [layer])
+    uvs = layer.uvmaps_vmap["UV"]["PointMap"]
+    # In a chunk and across chunks, the last value for a point wins.
+    assert uvs.pnt_ids.tolist() == [1, 2, 3]
+    assert np.allclose(uvs.values[:, 0], [0.5, 0.3, 0.4])
+
+
+def test_vmad_later_chunk_wins():
+    layer = _obj_layer()
+    layer.name = "Layer 1"
+    first = uv_records("UV", (1, 0, 0.1, 0), (2, 0, 0.2, 0), (1, 1, 0.3, 0))
+    read_uv_vmad(first, [layer], 0)
+    read_uv_vmad(uv_records("UV", (2, 0, 0.4, 0), (5, 2, 0.5, 0)), [layer], 0)
+    uvs = layer.uvmaps_vmad["UV"]["FaceMap"]
+    # A polygon in the later chunk replaces all of its earlier values.
+    assert uvs.pol_ids.tolist() == [0, 1, 2]
+    assert uvs.pnt_ids.tolist() == [2, 1, 5]
+    assert np.allclose(uvs.values[:, 0], [0.4, 0.3, 0.5])
+
+
+def test_edge_weights_follow_last_pols_chunk():
+    layer = _obj_layer()
+    layer.name = "Layer 1"
+    read_pols(vx_bytes(3, 0, 1, 2), [layer])
+    last_pols_count = read_pols(vx_bytes(4, 3, 4, 5, 6, 3, 7, 8, 9), [layer])
+    assert last_pols_count == 2
+
+    # As in UV and color VMADs, polygon 1 is the second polygon of the last
+    # POLS chunk, which is polygon 2 of the layer.
+    weights = struct.pack(">H", 1) + b"Edge Weight\0"
+    weights += vx_bytes(8, 1) + struct.pack(">f", 0.25)
+    weights += vx_bytes(3, 0) + struct.pack(">f", 0.75)
+    read_weight_vmad(weights, [layer], last_pols_count)
+
+    # Polygon 2 is 9 8 7 reversed, 8 is followed by 7.  Polygon 1 is
+    # 6 5 4 3, 3 wraps around to 6.
+    assert layer.edge_weights.edges.tolist() == [3 << 32 | 6, 7 << 32 | 8]
+    assert layer.edge_weights.values.tolist() == [0.75, 0.25]
@@ -0,0 +1,178 @@
+import os
+from io_scene_lwo.lwoImages import lwoImageIndex
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+
+
+def test_lwo_image_index(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    touch(str(second / "Wood.PNG"))
+    touch(str(first / "a" / "b" / "c" / "wood.png"))
+    touch(str(first / "z" / "wood.png"))
+    touch(str(first / "a" / "old_wood.png"))
+    touch(str(first / "deep" / "er" / "still" / "stone.jpg"))
+    touch(str(first / ".hidden" / "metal.tga"))
+
+    index = lwoImageIndex()
+    index.add_root(str(first))
+    index.add_root(str(second))
+    # The first search path wins, then the shallowest file.
+    assert index.find("WOOD.png") == str(first / "z" / "wood.png")
+    assert index.find("stone.jpg") == str(first / "deep" / "er" / "still" / "stone.jpg")
+    assert index.find("ood.png") is None
+    assert index.find("metal.tga") is None
+
+    # Directories reached twice are only read once.
+    index.add_root(str(tmp_path))
+    assert len(index.files["wood.png"]) == 3
+
+    flat = lwoImageIndex()
+    flat.add_root(str(second), recursive=False)
+    flat.add_root(str(first), recursive=False)
+    assert flat.find("wood.png") == str(second / "Wood.PNG")
+    assert flat.find("stone.jpg") is None
+
+
+def test_lwo_image_cache(tmp_path, monkeypatch):
+    from io_scene_lwo import lwoImages
+    from io_scene_lwo.lwoImages import lwoImageCache
+
+    library = tmp_path / "library"
+    extra = tmp_path / "extra"
+    touch(str(library / "wood" / "oak.png"))
+    touch(str(extra / "stone.png"))
+    # Give the folders an mtime in the past, so their listings are kept.
+    for d in (library, library / "wood", extra):
+        os.utime(str(d), ns=(10 ** 18, 10 ** 18))
+
+    scanned = []
+    scandir = os.scandir
+    monkeypatch.setattr(
+        lwoImages.os, "scandir", lambda p: scanned.append(p) or scandir(p)
+    )
+
+    filename = str(tmp_path / "cache" / "images.pickle")
+    cache = lwoImageCache(filename)
+    names = ["OAK.png", "stone.png"]
+    found = cache.resolve("model.lwo", names, [str(library)])
+    assert found == {"OAK.png": str(library / "wood" / "oak.png"), "stone.png": None}
+    assert len(scanned) == 2
+
+    # The missing image is remembered while the folders it was looked for
+    # in haven't changed, so none are read and the cache isn't written again.
+    saved = os.stat(filename).st_mtime_ns
+    os.utime(filename, ns=(saved - 10 ** 9, saved - 10 ** 9))
+    cache = lwoImageCache(filename)
+    found = cache.resolve("model.lwo", names, [str(library)])
+    assert found["OAK.png"] == str(library / "wood" / "oak.png")
+    assert found["stone.png"] is None
+    assert len(scanned) == 2
+    assert os.stat(filename).st_mtime_ns == saved - 10 ** 9
+    path, _, _, _, dirs = cache.models["model.lwo"]["stone.png"]
+    assert path is None and len(dirs) == 2
+
+    # Once it is put in the folder it is found, straight away.
+    touch(str(library / "stone.png"))
+    found = cache.resolve("model.lwo", names, [str(library)])
+    assert found["stone.png"] == str(library / "stone.png")
+    assert scanned[2:] == [str(library)]
+    os.remove(str(library / "stone.png"))
+    os.utime(str(library), ns=(10 ** 18, 10 ** 18))
+
+    # Or when it is put in a folder below it.
+    assert cache.resolve("model.lwo", names, [str(library)])["stone.png"] is None
+    touch(str(library / "wood" / "stone.png"))
+    found = cache.resolve("model.lwo", names, [str(library)])
+    assert found["stone.png"] == str(library / "wood" / "stone.png")
+    os.remove(str(library / "wood" / "stone.png"))
+    os.utime(str(library / "wood"), ns=(10 ** 18, 10 ** 18))
+
+    # A new search path is read for the missing image, the others are
+    # unchanged.
+    del scanned[:]
+    found = cache.resolve("model.lwo", names, [str(library), str(extra)])
+    assert found["stone.png"] == str(extra / "stone.png")
+    assert scanned == [str(extra)]
+
+    # A changed folder is read again, an unchanged one isn't.
+    touch(str(library / "wood" / "pine.png"))
+    os.utime(str(library / "wood"), ns=(2 * 10 ** 18, 2 * 10 ** 18))
+    del scanned[:]
+    found = cache.resolve("other.lwo", ["pine.png"], [str(library)])
+    assert found["pine.png"] == str(library / "wood" / "pine.png")
+    assert scanned == [str(library / "wood")]
+
+    cache.clear()
+    assert not os.path.exists(filename)
+
+
+def deep_tree(root, depth, branches):
+    """Folders branches wide and depth deep, each with a texture and some
+    files that aren't images."""
+    level = [root]
+    for d in range(depth):
+        below = []
+        for folder in level:
+            for b in range(branches):
+                path = os.path.join(folder, f"d{d}_{b}")
+                touch(os.path.join(path, f"tex_{d}_{b}.png"))
+                touch(os.path.join(path, "scene.blend1"))
+                touch(os.path.join(path, "notes.txt"))
+                below.append(path)
+        touch(os.path.join(folder, "cache", "leaf.png"))
+        level = below
+    touch(os.path.join(level[-1], "leaf.png"))
+    return level[-1]
+
+
+def test_lwo_image_walk(tmp_path, monkeypatch):
+    from collections import OrderedDict
+    from concurrent.futures import ThreadPoolExecutor
+    from io_scene_lwo import lwoImages
+    from io_scene_lwo.lwoImages import DEFAULT_IMAGE_EXTENSIONS
+
+    root = str(tmp_path)
+    leaf = deep_tree(root, 5, 3)
+    ignore = ["cache", "*.blend1"]
+    # Give the folders an mtime in the past, so their listings are kept.
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(10 ** 18, 10 ** 18))
+
+    listings = OrderedDict()
+    serial = lwoImageIndex(listings, 0, ignore, DEFAULT_IMAGE_EXTENSIONS)
+    serial.add_root(root)
+    with ThreadPoolExecutor(8) as pool:
+        threaded = lwoImageIndex(None, 0, ignore, DEFAULT_IMAGE_EXTENSIONS, pool)
+        threaded.add_root(root)
+
+    assert threaded.files == serial.files
+    assert len(serial.dirs) == 1 + 3 + 9 + 27 + 81 + 243
+    assert serial.find("leaf.png") == os.path.join(leaf, "leaf.png")
+    assert serial.find("scene.blend1") is None
+    assert serial.find("notes.txt") is None
+
+    # A second walk uses the listings, without reading any folder.
+    scanned = []
+    scandir = os.scandir
+    monkeypatch.setattr(
+        lwoImages.os, "scandir", lambda p: scanned.append(p) or scandir(p)
+    )
+    warm = lwoImageIndex(listings, 0, ignore, DEFAULT_IMAGE_EXTENSIONS)
+    warm.add_root(root)
+    assert scanned == []
+    assert warm.files == serial.files
+
+    # Stop once the wanted files are found, at the end of that level.
+    early = lwoImageIndex(None, 0, ignore)
+    early.add_root(root, wanted={"tex_1_2.png"})
+    assert len(early.dirs) == 1 + 3 + 9
+
+    shallow = lwoImageIndex(None, 2, ignore)
+    shallow.add_root(root)
+    assert shallow.find("tex_1_0.png") is not None
+    assert shallow.find("tex_2_0.png") is None
+    assert shallow.find("leaf.png") is None
@@ -0,0 +1,54 @@
+import numpy as np
+from io_scene_lwo.lwoIndex import lwoIndex
+from io_scene_lwo.lwoObject import lwoObject, _choices
+
+
+def test_lwo_index_layers():
+    index = lwoIndex("tests/basic/src/LWO2/box/box3-uv-layers.lwo")
+    index.read()
+    assert index.format == b"LWO2"
+    assert [layer.name for layer in index.layers] == ["Layer 2", "Layer 1", "Layer 10"]
+    assert index.layers[1].bbox == [[-0.5, -0.5, -0.5], [0.5, 0.5, 0.5]]
+    assert index.clips == {1: "C:storage/3d/box/cc0.png"}
+    assert "Top" in index.surf_names
+
+    chunks = index.layer_chunks(1, chunknames=(b"VMAP",))
+    assert [c.subtype for c in chunks] == [b"TXUV"]
+
+
+def test_lwo_index_read_layer():
+    index = lwoIndex("tests/basic/src/LWO2/box/box3-uv-layers.lwo")
+    index.read()
+    layer = index.read_layer(1, chunknames=(b"PNTS", b"POLS"))
+    assert layer.name == "Layer 1"
+    assert len(layer.pnts) == 8
+    assert len(layer.pols) == 6
+    assert len(layer.uvmaps_vmap) == 0
+
+
+def test_lwo_index_lwob():
+    index = lwoIndex("tests/basic/src/LWO/box/box3-uv-layers.lwo")
+    index.read()
+    assert index.format == b"LWOB"
+    assert len(index.layers) == 1
+    layer = index.read_layer(0)
+    assert len(layer.pols) == len(layer.surf_ids)
+
+
+def test_lwo_index_layer_threads():
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    index = lwoIndex(infile)
+    index.read()
+    assert index.layer_groups(_choices()) == [[0], [1], [2]]
+
+    serial = lwoObject(infile)
+    serial.read(_choices(LAYER_THREADS=1, USE_SESSION_CACHE=False))
+    threaded = lwoObject(infile)
+    threaded.read(_choices(LAYER_THREADS=3, USE_SESSION_CACHE=False))
+    assert [layer.name for layer in threaded.layers] == [
+        layer.name for layer in serial.layers
+    ]
+    for a, b in zip(serial.layers, threaded.layers):
+        assert np.array_equal(a.pols.indices, b.pols.indices)
+        assert np.array_equal(a.surf_ids, b.surf_ids)
+    assert threaded.surfs.keys() == serial.surfs.keys()
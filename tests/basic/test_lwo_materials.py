@@ -0,0 +1,34 @@
+from io_scene_lwo.lwoObject import lwoObject, _choices, _surf_texture
+
+
+def read_surfs(infile):
+    lwo = lwoObject(infile)
+    lwo.read(_choices(USE_SESSION_CACHE=False))
+    return lwo.surfs
+
+
+def test_lwo_surf_content_hash():
+    box1 = read_surfs("tests/basic/src/LWO2/box/box1.lwo")
+    box2 = read_surfs("tests/basic/src/LWO2/box/box2-uv.lwo")
+    lwob = read_surfs("tests/basic/src/LWO/box/box2-uv.lwo")
+
+    # Equal surfaces hash the same, from any file and either format.
+    assert box1["Top"].content_hash() == box2["Top"].content_hash()
+    assert box2["Back"].content_hash() == lwob["Back"].content_hash()
+    assert box1["Top"].content_hash() != box1["Bottom"].content_hash()
+
+    surf = box2["Back"]
+    key = surf.content_hash()
+    surf.colr = [0.5, 0.5, 0.5]
+    assert surf.content_hash() != key
+
+    # The images count, clip numbers, which are only good in one file, don't.
+    surf = box1["Front"]
+    texture = _surf_texture()
+    texture.image = "images/wood.png"
+    surf.textures["COLR"] = [texture]
+    key = surf.content_hash()
+    texture.clipid = 7
+    assert surf.content_hash() == key
+    texture.image = "other/wood.png"
+    assert surf.content_hash() != key
@@ -0,0 +1,114 @@
+import random
+import struct
+import numpy as np
+import pytest
+from io_scene_lwo import lwoObject as lwo_module
+from io_scene_lwo.lwoObject import lwoObject, _choices
+
+
+def read(infile, **kwargs):
+    lwo = lwoObject(infile)
+    lwo.read(
+        _choices(LOAD_HIDDEN=True, USE_SESSION_CACHE=False, LAYER_THREADS=1, **kwargs)
+    )
+    return lwo
+
+
+def lwo_string(s):
+    data = s.encode() + b"\0"
+    return data + b"\0" * (len(data) % 2)
+
+
+def vx(i):
+    return struct.pack(">H", i) if i < 0xFF00 else struct.pack(">I", i | 0xFF000000)
+
+
+def chunk(name, data):
+    return name + struct.pack(">L", len(data)) + data + b"\0" * (len(data) % 2)
+
+
+def mixed_lwo(path, npts=70000, npols=20000):
+    """A layer with polygons of several sizes, and points past 0xFF00 so
+    that some indexes take four bytes."""
+    rnd = random.Random(1)
+    pols = [rnd.sample(range(npts), rnd.choice([3, 4, 5, 7])) for _ in range(npols)]
+    uv_ids = sorted(rnd.sample(range(npts), npts // 3))
+    corners = [(pt, p) for p in rnd.sample(range(npols), npols // 3) for pt in pols[p]]
+
+    body = b"LWO2" + chunk(b"TAGS", lwo_string("Default"))
+    body += chunk(b"LAYR", struct.pack(">HH3f", 0, 0, 0, 0, 0) + lwo_string(""))
+    body += chunk(b"PNTS", np.arange(npts * 3, dtype=">f4").tobytes())
+    body += chunk(
+        b"POLS",
+        b"FACE"
+        + b"".join(struct.pack(">H", len(p)) + b"".join(map(vx, p)) for p in pols),
+    )
+    body += chunk(
+        b"VMAP",
+        b"TXUV\0\2"
+        + lwo_string("UV")
+        + b"".join(vx(i) + struct.pack(">2f", i, -i) for i in uv_ids),
+    )
+    body += chunk(
+        b"VMAD",
+        b"TXUV\0\2"
+        + lwo_string("UV")
+        + b"".join(vx(pt) + vx(p) + struct.pack(">2f", pt, p) for pt, p in corners),
+    )
+    path.write_bytes(b"FORM" + struct.pack(">L", len(body)) + body)
+    return pols
+
+
+@pytest.mark.parametrize("threads", [2, 5])
+def test_lwo_split_chunks(monkeypatch, threads):
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    whole = read(infile, SPLIT_CHUNK_SIZE=0)
+
+    # Split every chunk, over more threads than there are records.
+    monkeypatch.setattr(lwo_module.os, "cpu_count", lambda: threads)
+    split = read(infile, SPLIT_CHUNK_SIZE=1)
+    assert split.layers == whole.layers
+
+
+@pytest.mark.parametrize("threads", [3, 8])
+def test_lwo_split_mixed_chunks(tmp_path, monkeypatch, threads):
+    infile = tmp_path / "mixed.lwo"
+    pols = mixed_lwo(infile)
+    whole = read(str(infile), SPLIT_CHUNK_SIZE=0)
+
+    layer = whole.layers[0]
+    counts = [len(p) for p in pols]
+    assert np.array_equal(np.diff(layer.pols.offsets), counts)
+    # The points of each polygon are in reverse order.
+    expected = np.concatenate([p[::-1] for p in pols])
+    assert np.array_equal(layer.pols.indices, expected)
+
+    monkeypatch.setattr(lwo_module.os, "cpu_count", lambda: threads)
+    split = read(str(infile), SPLIT_CHUNK_SIZE=1024)
+    assert lwo_module.chunk_splitter.pool is not None
+    assert split.layers == whole.layers
+
+
+def test_lwo_split_size_per_read(monkeypatch):
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    monkeypatch.setattr(lwo_module.os, "cpu_count", lambda: 4)
+    slices = []
+    map_slices = lwo_module.chunk_splitter.map
+    monkeypatch.setattr(
+        lwo_module.chunk_splitter,
+        "map",
+        lambda func, bounds: slices.append(len(bounds)) or map_slices(func, bounds),
+    )
+
+    # One read's split size doesn't change how another one reads.
+    lwo = lwoObject(infile)
+    layers = lwo.iter_layers(
+        _choices(LOAD_HIDDEN=True, USE_SESSION_CACHE=False, SPLIT_CHUNK_SIZE=1)
+    )
+    next(layers)
+    split = len(slices)
+    assert split
+    read(infile, SPLIT_CHUNK_SIZE=0)
+    assert len(slices) == split
+    list(layers)
+    assert len(slices) > split
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from io_scene_lwo.lwoObject import lwoObject, _choices
+from io_scene_lwo.lwoStream import (
+    iter_records,
+    lwoLayer,
+    lwoPoints,
+    lwoPolygons,
+    lwoPTag,
+)
+
+
+@pytest.mark.parametrize(
+    "infile",
+    [
+        "tests/basic/src/LWO2/box/box3-uv-layers.lwo",
+        "tests/basic/src/LWO/box/box3-uv-layers.lwo",
+    ],
+)
+def test_lwo_stream(infile):
+    lwo = lwoObject(infile)
+    lwo.read(_choices(LOAD_HIDDEN=True, USE_SESSION_CACHE=False))
+    records = list(iter_records(infile, _choices(LOAD_HIDDEN=True)))
+
+    layers = [r for r in records if isinstance(r, lwoLayer)]
+    assert [r.name for r in layers] == [layer.name for layer in lwo.layers]
+    for n, layer in enumerate(lwo.layers):
+        pnts = [r.pnts for r in records if isinstance(r, lwoPoints) and r.layer == n]
+        assert np.array_equal(np.concatenate(pnts), layer.pnts)
+
+        pols = [r for r in records if isinstance(r, lwoPolygons) and r.layer == n]
+        assert sum(len(r.offsets) - 1 for r in pols) == len(layer.pols)
+
+        surf_ids = np.full(len(layer.pols), -1)
+        for r in records:
+            if isinstance(r, lwoPTag) and r.layer == n and r.kind == b"SURF":
+                surf_ids[r.pol_ids] = r.tags
+        assert np.array_equal(surf_ids, layer.surf_ids)
+
+
+def test_lwo_iter_layers():
+    infile = "tests/basic/src/LWO2/box/box3-uv-layers.lwo"
+    lwo = lwoObject(infile)
+    lwo.read(_choices(LOAD_HIDDEN=True, USE_SESSION_CACHE=False))
+
+    streamed = lwoObject(infile)
+    layers = []
+    for layer in streamed.iter_layers(_choices(LOAD_HIDDEN=True)):
+        # Only the layer being read is kept.
+        assert len(streamed.layers) <= 1
+        layers.append(layer)
+    assert layers == lwo.layers
+    assert streamed.surfs == lwo.surfs
+    assert streamed.clips == lwo.clips
@@ -35,6 +35,19 @@ def test_load_lwo3():
     load_lwo(infiles, "_d", search_paths=["../images",], USE_EXISTING_MATERIALS=True)
 
 
+def test_load_lwo3_batch():
+    # Parsed in parallel, but built in the same order as test_load_lwo3.
+    infiles = [
+        "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_hull.lwo",
+        "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_nacell_L.lwo",
+        "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_nacell_R.lwo",
+        "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_reg_hull.lwo",
+        "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_reg_nacell_L.lwo",
+        "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_reg_nacell_R.lwo",
+    ]
+    load_lwo(infiles, "_d", search_paths=["../images",], USE_EXISTING_MATERIALS=True, batch=True)
+
+
 def test_load_lwo4():
     infile = "tests/lwo_interceptor/src/LWO2/Federation - Interceptor/objects/interceptor_nacell_L.lwo"
     with pytest.raises(Exception):